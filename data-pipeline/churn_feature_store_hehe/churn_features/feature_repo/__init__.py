@@ -1,2 +1,2 @@
 from .churn_entities import customer
-from .feature_views import customer_demographics, customer_behavior, churn_target
\ No newline at end of file
+from .feature_views import customer_demographics, customer_behavior, customer_features, churn_target, churn_features
\ No newline at end of file
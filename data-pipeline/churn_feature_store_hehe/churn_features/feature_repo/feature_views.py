@@ -1,4 +1,4 @@
-from feast import FeatureView, Field
+from feast import FeatureService, FeatureView, Field
 from feast.types import Float32, Int64, String
 from datetime import timedelta
 from churn_entities import customer
@@ -36,6 +36,27 @@ customer_behavior = FeatureView(
     online=True
 )
 
+# All serving features in one view, so an online lookup is a single store read
+customer_features = FeatureView(
+    name="customer_features",
+    entities=[customer],
+    ttl=None,
+    schema=[
+        Field(name="age", dtype=Float32),
+        Field(name="gender", dtype=String),
+        Field(name="tenure_months", dtype=Float32),
+        Field(name="subscription_type", dtype=String),
+        Field(name="contract_length", dtype=String),
+        Field(name="usage_frequency", dtype=Float32),
+        Field(name="support_calls", dtype=Float32),
+        Field(name="payment_delay_days", dtype=Float32),
+        Field(name="total_spend", dtype=Float32),
+        Field(name="last_interaction_days", dtype=Float32),
+    ],
+    source=customer_stats_source,
+    online=True
+)
+
 # Churn target feature view
 churn_target = FeatureView(
     name="churn_target",
@@ -46,4 +67,11 @@ churn_target = FeatureView(
     ],
     source=customer_stats_source,
     online=True
-)
\ No newline at end of file
+)
+
+# Feature service for online serving; resolved once by clients instead of
+# parsing feature reference strings on every request
+churn_features = FeatureService(
+    name="churn_features",
+    features=[customer_features]
+)
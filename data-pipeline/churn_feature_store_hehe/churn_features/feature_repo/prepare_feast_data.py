@@ -1,100 +1,231 @@
-import pandas as pd
+import csv
 import numpy as np
-from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
 import pyarrow.parquet as pq
 import os
 
-def prepare_data_for_feast(input_path, output_path="data/processed_churn_data.parquet"):
+# Map column names to Feast-compatible names
+COLUMN_MAPPING = {
+    'Age': 'age',
+    'Gender': 'gender',
+    'Tenure': 'tenure_months',
+    'Usage Frequency': 'usage_frequency',
+    'Support Calls': 'support_calls',
+    'Payment Delay': 'payment_delay_days',
+    'Subscription Type': 'subscription_type',
+    'Contract Length': 'contract_length',
+    'Total Spend': 'total_spend',
+    'Last Interaction': 'last_interaction_days',
+    'Churn': 'churned',
+    'Tenure_Age_Ratio': 'tenure_age_ratio',
+    'Spend_per_Usage': 'spend_per_usage',
+    'Support_Calls_per_Tenure': 'support_calls_per_tenure',
+}
+
+# Read categorical columns as strings and numeric features as float32,
+# matching the Float32 fields declared in feature_views.py
+CSV_COLUMN_TYPES = {
+    'Gender': pa.string(),
+    'Subscription Type': pa.string(),
+    'Contract Length': pa.string(),
+    'Age': pa.float32(),
+    'Tenure': pa.float32(),
+    'Usage Frequency': pa.float32(),
+    'Support Calls': pa.float32(),
+    'Payment Delay': pa.float32(),
+    'Total Spend': pa.float32(),
+    'Last Interaction': pa.float32(),
+    'Tenure_Age_Ratio': pa.float32(),
+    'Spend_per_Usage': pa.float32(),
+    'Support_Calls_per_Tenure': pa.float32(),
+}
+
+# Select and order columns for Feast, typed to match the customer entity in
+# churn_entities.py and the FeatureViews in feature_views.py so every run
+# writes an identical Parquet schema
+FEAST_SCHEMA = pa.schema([
+    ('customer_id', pa.int64()),
+    ('event_timestamp', pa.timestamp('s')),
+    ('created_timestamp', pa.timestamp('s')),
+    ('age', pa.float32()),
+    ('gender', pa.string()),
+    ('tenure_months', pa.float32()),
+    ('usage_frequency', pa.float32()),
+    ('support_calls', pa.float32()),
+    ('payment_delay_days', pa.float32()),
+    ('subscription_type', pa.string()),
+    ('contract_length', pa.string()),
+    ('total_spend', pa.float32()),
+    ('last_interaction_days', pa.float32()),
+    ('tenure_age_ratio', pa.float32()),
+    ('spend_per_usage', pa.float32()),
+    ('support_calls_per_tenure', pa.float32()),
+    ('avg_monthly_spend', pa.float32()),
+    ('churn_risk_score', pa.float32()),
+    ('churned', pa.int8()),
+])
+
+FEAST_COLUMNS = FEAST_SCHEMA.names
+
+# Raw CSV columns the Feast output is built from; everything else is skipped
+# by the CSV reader instead of being parsed and dropped
+SOURCE_COLUMNS = {'CustomerID', 'avg_monthly_spend', 'churn_risk_score', *COLUMN_MAPPING}
+
+# Low-cardinality string columns benefit from Parquet dictionary + RLE pages
+DICTIONARY_COLUMNS = ['gender', 'subscription_type', 'contract_length']
+
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _timestamp_array(epoch_seconds: np.ndarray) -> pa.Array:
+    """Wrap an int64 epoch-seconds buffer as an Arrow timestamp array without copying"""
+    return pa.Array.from_buffers(
+        pa.timestamp('s'),
+        len(epoch_seconds),
+        [None, pa.py_buffer(epoch_seconds)],
+    )
+
+
+def _to_feast_batch(
+    batch: pa.RecordBatch,
+    current_time: np.datetime64,
+    rng: np.random.Generator,
+) -> pa.RecordBatch:
     """
-    Convert processed churn data to Feast-compatible format
+    Rename, derive and select the Feast columns for one CSV record batch
     """
-    # Load your processed data
-    df = pd.read_csv(input_path)
-    
-    # Add timestamp columns required by Feast
-    current_time = datetime.now()
-    
+    n = batch.num_rows
+    batch = batch.rename_columns([COLUMN_MAPPING.get(name, name) for name in batch.schema.names])
+    columns = dict(zip(batch.schema.names, batch.columns))
+
+    def as_array(name):
+        # Columns declared float32 in CSV_COLUMN_TYPES are viewed without a cast
+        column = columns[name]
+        if column.type != pa.float32():
+            column = pc.cast(column, pa.float32())
+        return column.to_numpy(zero_copy_only=False)
+
     # Create event timestamp (simulate data from last 90 days)
-    df['event_timestamp'] = current_time - pd.to_timedelta(
-        np.random.randint(0, 90 * 24 * 60 * 60, size=len(df)),
-        unit='s'
-    )
-    
+    base = current_time.astype(np.int64)
+    offsets = rng.integers(0, 90 * 24 * 60 * 60, size=n, dtype=np.int32)
+    columns['event_timestamp'] = _timestamp_array(base - offsets)
+
     # Create created timestamp (when feature was computed)
-    df['created_timestamp'] = current_time
-    
-    # Ensure customer_id is string
-    df['customer_id'] = df['CustomerID'].astype(str)
-    
-    # Map column names to Feast-compatible names
-    column_mapping = {
-        'Age': 'age',
-        'Gender': 'gender',
-        'Tenure': 'tenure_months',
-        'Usage Frequency': 'usage_frequency',
-        'Support Calls': 'support_calls',
-        'Payment Delay': 'payment_delay_days',
-        'Subscription Type': 'subscription_type',
-        'Contract Length': 'contract_length',
-        'Total Spend': 'total_spend',
-        'Last Interaction': 'last_interaction_days',
-        'Churn': 'churned',
-        'Tenure_Age_Ratio': 'tenure_age_ratio',
-        'Spend_per_Usage': 'spend_per_usage',
-        'Support_Calls_per_Tenure': 'support_calls_per_tenure',
-    }
-    
-    # Rename columns
-    df = df.rename(columns=column_mapping)
-    
+    columns['created_timestamp'] = _timestamp_array(np.full(n, base, dtype=np.int64))
+
+    # customer_id is the INT64 join key of the customer entity; the cast to
+    # FEAST_SCHEMA rejects non-integral ids
+    columns['customer_id'] = columns['CustomerID']
+
     # Add any missing engineered features
-    if 'avg_monthly_spend' not in df.columns:
-        df['avg_monthly_spend'] = df['total_spend'] / np.maximum(df['tenure_months'], 1)
-    
-    if 'churn_risk_score' not in df.columns:
-        # Simple risk score calculation
-        df['churn_risk_score'] = (
-            df['payment_delay_days'] * 0.3 +
-            (df['support_calls'] / np.maximum(df['tenure_months'], 1)) * 0.2 +
-            (1 - (df['last_interaction_days'] / 30)) * 0.5
-        ).clip(0, 1)
-    
-    # Select and order columns for Feast
-    feast_columns = [
-        'customer_id',
-        'event_timestamp',
-        'created_timestamp',
-        'age',
-        'gender',
-        'tenure_months',
-        'usage_frequency',
-        'support_calls',
-        'payment_delay_days',
-        'subscription_type',
-        'contract_length',
-        'total_spend',
-        'last_interaction_days',
-        'tenure_age_ratio',
-        'spend_per_usage',
-        'support_calls_per_tenure',
-        'avg_monthly_spend',
-        'churn_risk_score',
-        'churned'
-    ]
-    
-    df_feast = df[feast_columns].copy()
-    
+    missing_avg_spend = 'avg_monthly_spend' not in columns
+    missing_risk_score = 'churn_risk_score' not in columns
+    if missing_avg_spend or missing_risk_score:
+        # Clamped denominator, allocated once and reused as scratch space below
+        tenure = np.maximum(as_array('tenure_months'), np.float32(1))
+
+    if missing_avg_spend:
+        columns['avg_monthly_spend'] = pa.array(np.divide(as_array('total_spend'), tenure))
+
+    if missing_risk_score:
+        # Simple risk score calculation, evaluated in place on two buffers
+        score = np.divide(as_array('last_interaction_days'), -30.0)
+        score += 1.0
+        score *= 0.5
+        np.divide(as_array('support_calls'), tenure, out=tenure)
+        tenure *= 0.2
+        score += tenure
+        np.multiply(as_array('payment_delay_days'), 0.3, out=tenure)
+        score += tenure
+        np.clip(score, 0.0, 1.0, out=score)
+        columns['churn_risk_score'] = pa.array(score)
+
+    return pa.RecordBatch.from_arrays(
+        [pc.cast(columns[field.name], field.type) for field in FEAST_SCHEMA],
+        schema=FEAST_SCHEMA,
+    )
+
+
+def _read_csv_header(input_path):
+    """Return the column names from the first line of a CSV file"""
+    with open(input_path, newline='') as f:
+        return next(csv.reader(f))
+
+
+def _transform_batches(reader, current_time, rng, max_workers):
+    """
+    Transform CSV record batches on a thread pool, yielding them in input order
+
+    At most `max_workers` batches are in flight, which bounds memory use.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque()
+        for batch in reader:
+            in_flight.append(executor.submit(_to_feast_batch, batch, current_time, rng))
+            if len(in_flight) >= max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def prepare_data_for_feast(
+    input_path,
+    output_path="data/processed_churn_data.parquet",
+    max_workers=None,
+):
+    """
+    Convert processed churn data to Feast-compatible format
+
+    The CSV is streamed in Arrow record batches and appended to the Parquet
+    output, so the full dataset is never materialized in memory. Batches are
+    transformed in parallel on `max_workers` threads (default: CPU count).
+    """
+    current_time = np.datetime64(datetime.now(), 's')
+    rng = np.random.default_rng()
+    max_workers = max_workers or os.cpu_count() or 1
+
+    reader = pv.open_csv(
+        input_path,
+        read_options=pv.ReadOptions(block_size=64 << 20, use_threads=True),
+        convert_options=pv.ConvertOptions(
+            column_types=CSV_COLUMN_TYPES,
+            include_columns=[
+                name for name in _read_csv_header(input_path) if name in SOURCE_COLUMNS
+            ],
+        ),
+    )
+
     # Save as Parquet (Feast recommended format)
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df_feast.to_parquet(output_path, index=False)
-    
-    print(f"Data prepared for Feast. Shape: {df_feast.shape}")
+
+    num_rows = 0
+    writer = pq.ParquetWriter(
+        output_path,
+        FEAST_SCHEMA,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=DICTIONARY_COLUMNS,
+        data_page_size=1 << 20,
+        write_statistics=True,
+    )
+    try:
+        for feast_batch in _transform_batches(reader, current_time, rng, max_workers):
+            writer.write_batch(feast_batch, row_group_size=ROW_GROUP_SIZE)
+            num_rows += feast_batch.num_rows
+    finally:
+        writer.close()
+
+    print(f"Data prepared for Feast. Shape: {(num_rows, len(FEAST_COLUMNS))}")
     print(f"Saved to: {output_path}")
-    
-    return df_feast
+
+    return output_path
 
 if __name__ == "__main__":
     # Update this path to your processed data
     input_file = "../../../data/processed/df_processed.csv"
-    prepare_data_for_feast(input_file)
\ No newline at end of file
+    prepare_data_for_feast(input_file)
@@ -1,7 +1,30 @@
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
-df = pd.read_parquet("churn_feature_store/churn_features/feature_repo/data/processed_churn_data.parquet")
+path = "churn_feature_store/churn_features/feature_repo/data/processed_churn_data.parquet"
 
-customer_ids = df["customer_id"].unique()
-print("Total unique customers:", len(customer_ids))
-print(df.head())
\ No newline at end of file
+# Parsed Parquet footers, reused by every read of the same file
+_parquet_files: dict[str, pq.ParquetFile] = {}
+
+
+def get_parquet_file(file_path: str = path) -> pq.ParquetFile:
+    """Open a Parquet file once and reuse its parsed footer and row-group metadata"""
+    if file_path not in _parquet_files:
+        _parquet_files[file_path] = pq.ParquetFile(file_path, pre_buffer=True, buffer_size=8 << 20)
+    return _parquet_files[file_path]
+
+
+def get_customer_ids(file_path: str = path) -> pa.ChunkedArray:
+    """Read only the customer_id column"""
+    return get_parquet_file(file_path).read(columns=["customer_id"]).column("customer_id")
+
+
+def get_preview(file_path: str = path, num_rows: int = 5) -> pa.RecordBatch:
+    """Read the first rows without decoding the rest of the file"""
+    return next(get_parquet_file(file_path).iter_batches(batch_size=num_rows))
+
+
+if __name__ == "__main__":
+    print("Total unique customers:", pc.count_distinct(get_customer_ids()).as_py())
+    print(get_preview().to_pandas())
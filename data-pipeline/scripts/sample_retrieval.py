@@ -7,18 +7,17 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 repo_path = os.path.join(project_root, "churn_feature_store", "churn_features", "feature_repo")
 
 FEATURES = [
-    # ---------- customer_demographics ----------
-    "customer_demographics:age",
-    "customer_demographics:gender",
-    "customer_demographics:tenure_months",
-    "customer_demographics:subscription_type",
-    "customer_demographics:contract_length",
-    # ---------- customer_behavior ----------
-    "customer_behavior:usage_frequency",
-    "customer_behavior:support_calls",
-    "customer_behavior:payment_delay_days",
-    "customer_behavior:total_spend",
-    "customer_behavior:last_interaction_days",
+    # ---------- customer_features (single view: one online store read) ----------
+    "customer_features:age",
+    "customer_features:gender",
+    "customer_features:tenure_months",
+    "customer_features:subscription_type",
+    "customer_features:contract_length",
+    "customer_features:usage_frequency",
+    "customer_features:support_calls",
+    "customer_features:payment_delay_days",
+    "customer_features:total_spend",
+    "customer_features:last_interaction_days",
 ]
 
 
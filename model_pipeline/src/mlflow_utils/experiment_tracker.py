@@ -2,14 +2,56 @@
 Docstring for model_pipeline.src.mlflow_utils.experiment_tracker
 """
 import mlflow
+import queue
+import threading
+import time
 from typing import Any
 from contextlib import contextmanager
+from functools import lru_cache
 from mlflow import MlflowClient
 from loguru import logger
+from mlflow.entities import Metric, Param, RunTag
 from mlflow.entities.run import Run
 from mlflow.store.entities.paged_list import PagedList
 
 
+@lru_cache(maxsize=32)
+def _get_client(tracking_uri: str) -> MlflowClient:
+    """Reuse a single MlflowClient per tracking server"""
+    return MlflowClient(tracking_uri=tracking_uri)
+
+
+@lru_cache(maxsize=32)
+def _resolve_experiment_id(
+    tracking_uri: str,
+    experiment_name: str,
+    artifact_location: str | None = None,
+) -> str:
+    """
+    Get existing experiment or create a new one
+
+    Cached per (tracking_uri, experiment_name, artifact_location) so repeated
+    tracker construction does not hit the tracking server again.
+    """
+    experiment = mlflow.get_experiment_by_name(experiment_name)
+    if experiment is None:
+        logger.info(f"Creating new experiment: {experiment_name=}")
+        experiment_id = mlflow.create_experiment(
+            name=experiment_name,
+            artifact_location=artifact_location
+        )
+    else:
+        experiment_id = experiment.experiment_id
+        logger.info(f"Using existing experiment: {experiment_name=} | {experiment_id=}")
+    return experiment_id
+
+
+# Per-request limits of the MLflow log_batch API
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+
+
 class ExperimentTracker:
     def __init__(
         self,
@@ -31,25 +73,32 @@ class ExperimentTracker:
 
         mlflow.set_tracking_uri(tracking_uri)
 
-        self.client = MlflowClient(tracking_uri=tracking_uri)
+        self.client = _get_client(tracking_uri)
         self.experiment_id  = self._get_or_create_experiment()
+
+        # Params, metrics and tags are queued per run and sent with log_batch
+        self._pending_run_id: str | None = None
+        self._pending_metrics: list[Metric] = []
+        self._pending_params: dict[str, Param] = {}
+        self._pending_tags: dict[str, RunTag] = {}
+
+        # Logging requests are sent from a background thread so tracking
+        # server latency stays off the training path
+        self._q: queue.Queue = queue.Queue()
+        self._t: threading.Thread | None = None
+        self._errors: list[Exception] = []
+
         logger.info(f"Initialized experiment tracker: {experiment_name}")
         logger.info(f"Tracking URI: {tracking_uri}")
         logger.info(f"Experiment ID: {self.experiment_id }")
     
     def _get_or_create_experiment(self) -> str:
         """Get existing experiment or a new one"""
-        experiment = mlflow.get_experiment_by_name(self.experiment_name)
-        if experiment is None:
-            logger.info(f"Creating new experiment: {self.experiment_name=}")
-            experiment_id = mlflow.create_experiment(
-                name=self.experiment_name,
-                artifact_location=self.artifact_location
-            )
-        else:
-            experiment_id = experiment.experiment_id
-            logger.info(f"Using existing experiment: {self.experiment_name=} | {experiment_id=}")
-        return experiment_id
+        return _resolve_experiment_id(
+            self.tracking_uri,
+            self.experiment_name,
+            self.artifact_location,
+        )
 
     @contextmanager
     def start_run(
@@ -76,55 +125,184 @@ class ExperimentTracker:
             nested=nested
         ) as run:
             if tags: 
-                mlflow.set_tags(tags)
+                self.set_tags(tags)
             
             logger.info(f"Started MLflow run: {run.info.run_id}")
             if run_name:
                 logger.info(f"Run name: {run_name}")
             
-            yield run
+            try:
+                yield run
+            finally:
+                self.flush()
             
             logger.info(f"Completed MLflow run: {run.info.run_id}")
+
+    def _active_run_id(self) -> str:
+        run = mlflow.active_run()
+        if run is None:
+            raise RuntimeError("No active MLflow run to log to")
+        return run.info.run_id
+
+    def _enqueue(
+        self,
+        metrics: dict[str, float] | None = None,
+        params: dict[str, Any] | None = None,
+        tags: dict[str, Any] | None = None,
+        step: int | None = None,
+    ):
+        """Queue entries for the active run, flushing whenever a log_batch limit is reached"""
+        run_id = self._active_run_id()
+        if self._pending_run_id not in (None, run_id):
+            self._submit_pending()
+        self._pending_run_id = run_id
+
+        timestamp = int(time.time() * 1000)
+        self._pending_metrics.extend(
+            Metric(key, float(value), timestamp, step or 0)
+            for key, value in (metrics or {}).items()
+        )
+        self._pending_params.update(
+            (key, Param(key, str(value))) for key, value in (params or {}).items()
+        )
+        self._pending_tags.update(
+            (key, RunTag(key, str(value))) for key, value in (tags or {}).items()
+        )
+
+        if (
+            len(self._pending_metrics) >= MAX_METRICS_PER_BATCH
+            or len(self._pending_params) >= MAX_PARAMS_PER_BATCH
+            or len(self._pending_tags) >= MAX_TAGS_PER_BATCH
+        ):
+            self._submit_pending()
+
+    def _submit(self, fn, **kwargs):
+        """Hand a client call to the background logging thread"""
+        if self._t is None or not self._t.is_alive():
+            self._t = threading.Thread(target=self._drain, name="mlflow-logging", daemon=True)
+            self._t.start()
+        self._q.put((fn, kwargs))
+
+    def _drain(self):
+        """Background worker issuing queued client calls in order"""
+        while True:
+            fn, kwargs = self._q.get()
+            try:
+                fn(**kwargs)
+            except Exception as e:
+                logger.error(f"MLflow logging failed: {e}")
+                self._errors.append(e)
+            finally:
+                self._q.task_done()
+
+    def flush(self):
+        """Send everything queued and wait until the background thread has logged it"""
+        self._submit_pending()
+        self._q.join()
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise errors[0]
+
+    def _submit_pending(self):
+        """Split queued params, metrics and tags into log_batch-sized requests"""
+        if self._pending_run_id is None:
+            return
+
+        run_id = self._pending_run_id
+        metrics = self._pending_metrics
+        params = list(self._pending_params.values())
+        tags = list(self._pending_tags.values())
+        self._pending_run_id = None
+        self._pending_metrics, self._pending_params, self._pending_tags = [], {}, {}
+
+        while metrics or params or tags:
+            batch_params, params = params[:MAX_PARAMS_PER_BATCH], params[MAX_PARAMS_PER_BATCH:]
+            batch_tags, tags = tags[:MAX_TAGS_PER_BATCH], tags[MAX_TAGS_PER_BATCH:]
+            n_metrics = MAX_METRICS_PER_BATCH - len(batch_params) - len(batch_tags)
+            batch_metrics, metrics = metrics[:n_metrics], metrics[n_metrics:]
+            self._submit(
+                self.client.log_batch,
+                run_id=run_id,
+                metrics=batch_metrics,
+                params=batch_params,
+                tags=batch_tags,
+            )
+            logger.debug(
+                f"Queued batch: {len(batch_metrics)} metrics, "
+                f"{len(batch_params)} parameters, {len(batch_tags)} tags"
+            )
     
     def log_param(self, key: str, value: Any):
         """Log a single parameter"""
-        mlflow.log_param(key, value)
+        self._enqueue(params={key: value})
     
     def log_params(self, params: dict[str, Any]):
         """Log multiple parameters"""
-        mlflow.log_params(params)
+        self._enqueue(params=params)
         logger.debug(f"Logged {len(params)} parameters")
     
     def log_metric(self, key: str, value: float, step: int | None = None):
         """Log a single metric"""
-        mlflow.log_metric(key, value, step=step)
+        self._enqueue(metrics={key: value}, step=step)
     
     def log_metrics(self, metrics: dict[str, float], step: int | None = None):
         """Log multiple metrics"""
-        mlflow.log_metrics(metrics, step=step)
+        self._enqueue(metrics=metrics, step=step)
         logger.debug(f"Logged {len(metrics)} metrics")
     
+    def log_batch(
+        self,
+        metrics: dict[str, float] | None = None,
+        params: dict[str, Any] | None = None,
+        tags: dict[str, Any] | None = None,
+        step: int | None = None,
+    ):
+        """
+        Log metrics, params and tags to the active run in a single request
+        
+        Anything still queued for the run is sent along with it.
+        
+        Args:
+            metrics: Dictionary of metrics
+            params: Dictionary of parameters
+            tags: Dictionary of tags
+            step: Step for all metrics in the batch
+        """
+        self._enqueue(metrics=metrics, params=params, tags=tags, step=step)
+        self.flush()
+    
     def log_artifact(self, local_path: str, artifact_path: str | None = None):
-        """Log an artifact file"""
-        mlflow.log_artifact(local_path, artifact_path)
+        """Log an artifact file (uploaded in the background; keep the file until the run ends)"""
+        self._submit(
+            self.client.log_artifact,
+            run_id=self._active_run_id(),
+            local_path=local_path,
+            artifact_path=artifact_path,
+        )
         logger.debug(f"Logged artifact: {local_path}")
     
     def log_dict(self, dictionary: dict, filename: str):
         """Log a dictionary as JSON artifact"""
-        mlflow.log_dict(dictionary, filename)
+        self._submit(
+            self.client.log_dict,
+            run_id=self._active_run_id(),
+            dictionary=dict(dictionary),
+            artifact_file=filename,
+        )
         logger.debug(f"Logged dictionary: {filename}")
     
     def set_tag(self, key: str, value: Any):
         """Set a single tag"""
-        mlflow.set_tag(key, value)
+        self._enqueue(tags={key: value})
     
     def set_tags(self, tags: dict[str, Any]):
         """Set multiple tags"""
-        mlflow.set_tags(tags)
+        self._enqueue(tags=tags)
         logger.debug(f"Set {len(tags)} tags")
     
     def get_run(self, run_id: str):
         """Get run details"""
+        self.flush()
         return self.client.get_run(run_id)
 
     def search_runs(
@@ -144,6 +322,7 @@ class ExperimentTracker:
         Returns:
             List of runs
         """
+        self.flush()
         return self.client.search_runs(
             experiment_ids=[self.experiment_id],
             filter_string=filter_string,
@@ -180,6 +359,7 @@ class ExperimentTracker:
         return best_run
 
     def end_run(self):
+        self.flush()
         mlflow.end_run()
         logger.info("Ended Mlflow run")
 
@@ -17,23 +17,35 @@ class ModelRegistry:
         self,
         run_id: str,
         metric: str
-    ):
-        all_experiments = mlflow.search_runs(search_all_experiments=True)
-        print(all_experiments)
-        evaluation = all_experiments[ #type:ignore
-            (all_experiments["tags.source_run_id"] == f"{run_id}") & #type:ignore
-            (all_experiments["status"] == "FINISHED") #type:ignore
-        ]
+    ) -> float | None:
+        """
+        Get a metric from the latest finished evaluation run of a training run
 
-        latest_eval = evaluation.sort_values(
-            by="end_time",
-            ascending=False
-        ).head(1)
+        The tag/status filter and ordering are evaluated by the tracking
+        server, so only the matching run is returned.
 
-        eval_run_id = latest_eval['run_id'].values.tolist()[0]
-        eval_run = self.client.get_run(eval_run_id)
+        Args:
+            run_id: Training run ID referenced by the eval run's source_run_id tag
+            metric: Metric name
 
-        return eval_run.data.metrics[metric]
+        Returns:
+            Metric value, or None if no evaluation run or metric exists
+        """
+        runs = mlflow.search_runs(
+            search_all_experiments=True,
+            filter_string=(
+                f"tags.source_run_id = '{run_id}' "
+                f"and attributes.status = 'FINISHED'"
+            ),
+            order_by=["attributes.end_time DESC"],
+            max_results=1,
+            output_format="list",
+        )
+        if not runs:
+            logger.warning(f"No finished evaluation run found for {run_id=}")
+            return None
+
+        return runs[0].data.metrics.get(metric) #type:ignore
     
     def register_model(
         self,
@@ -70,18 +82,10 @@ class ModelRegistry:
             name=model_name,
             source=model_uri,
             run_id=model_uri.split("/")[1] if "runs:" in model_uri else None,
+            tags=tags,
             description=description,
         )
 
-        if tags:
-            for key, val in tags.items():
-                self.client.set_model_version_tag(
-                    name=model_name,
-                    version=model_version.version,
-                    key=key,
-                    value=val
-                )
-        
         logger.info(f"Model registered: {model_name} v{model_version.version}")
         return model_version
     
@@ -164,6 +168,31 @@ class ModelRegistry:
             alias=alias,
         )
 
+    def find_model_version_by_global_alias(
+        self,
+        alias: str,
+    ) -> ModelVersion | None:
+        """
+        Find the model version holding an alias across all registered models
+
+        Registered models carry their alias -> version map, so this resolves
+        the alias from one search instead of fetching every model version.
+
+        Args:
+            alias: Alias name
+
+        Returns:
+            ModelVersion object, or None if no model holds the alias
+        """
+        for model in self.client.search_registered_models():
+            version = (model.aliases or {}).get(alias)
+            if version is not None:
+                return self.client.get_model_version(
+                    name=model.name,
+                    version=version,
+                )
+        return None
+
     def get_latest_versions(
         self,
         model_name: str,
@@ -342,17 +371,8 @@ class ModelRegistry:
             f"Candidate {model_name} v{version} {metric_name}: {candidate_metric:.4f}"
         )
 
-        current_champion = None
+        current_champion = self.find_model_version_by_global_alias(to_alias)
 
-        for mv in self.search_model_versions():
-            mv_details = self.client.get_model_version(
-                name=mv.name,
-                version=mv.version,
-            )
-            if mv_details.aliases and to_alias in mv_details.aliases:
-                current_champion = mv_details
-                break
-                
         if current_champion:
             logger.info(
             f"Current champion: {current_champion.name} v{current_champion.version}"
@@ -1,6 +1,12 @@
 """
 Docstring for model_pipelinene.src.mlflow_utils.evaluator
 """
+import hashlib
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import mlflow
 import mlflow.models
 import numpy as np
@@ -10,12 +16,166 @@ from mlflow.models import MetricThreshold
 
 from src.mlflow_utils.experiment_tracker import ExperimentTracker
 
+PREDICTION_COL = "prediction"
+
+
+def data_fingerprint(eval_data: pd.DataFrame) -> str:
+    """Content hash of a DataFrame's column names and values, ignoring the index"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(map(str, eval_data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(eval_data, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class _PredictionCache:
+    """On-disk cache of model predictions keyed on model URI and evaluation data"""
+
+    def __init__(self, cache_dir: str | Path):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def is_cacheable(model_uri: str) -> bool:
+        """Only URIs pinned to a run or a model version always resolve to the same model"""
+        return (
+            model_uri.startswith("runs:/")
+            or re.fullmatch(r"models:/[^/@]+/\d+", model_uri) is not None
+        )
+
+    @staticmethod
+    def key(model_uri: str, data_hash: str, target_col: str) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(model_uri.encode())
+        digest.update(target_col.encode())
+        digest.update(data_hash.encode())
+        return digest.hexdigest()
+
+    def get_or_predict(
+        self,
+        model_uri: str,
+        eval_data: pd.DataFrame,
+        target_col: str,
+        data_hash: str | None = None,
+    ) -> np.ndarray:
+        """
+        Return model predictions, running inference only on a cache miss
+        
+        Args:
+            data_hash: Precomputed data_fingerprint(eval_data), computed if not given
+        
+        Returns:
+            Array of predictions aligned with eval_data
+        """
+        data_hash = data_hash or data_fingerprint(eval_data)
+        cache_path = self.cache_dir / f"{self.key(model_uri, data_hash, target_col)}.parquet"
+        if cache_path.exists():
+            logger.info(f"Using cached predictions: {cache_path}")
+            return pd.read_parquet(cache_path)[PREDICTION_COL].to_numpy()
+
+        model = mlflow.pyfunc.load_model(model_uri)
+        predictions = model.predict(eval_data.drop(columns=[target_col]))
+
+        # Write to a unique temp file and rename, so concurrent writers of the
+        # same key never expose a partially written file
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+        pd.DataFrame({PREDICTION_COL: predictions}).to_parquet(tmp_path, index=False)
+        tmp_path.replace(cache_path)
+        logger.info(f"Cached predictions: {cache_path}")
+        return predictions
+
 
 class ModelEvaluator:
     def __init__(self, config: dict, experiment_tracker: ExperimentTracker):
         self.config = config
         self.tracker = experiment_tracker
         self.evaluation_results = None
+
+        cache_config = self.config.get("cache", {})
+        self.prediction_cache = (
+            _PredictionCache(cache_config.get("dir", ".cache/predictions"))
+            if cache_config.get("enable", True)
+            else None
+        )
+
+    def predict(
+        self,
+        model_uri: str,
+        eval_data: pd.DataFrame,
+        target_col: str,
+        data_hash: str | None = None,
+    ) -> np.ndarray:
+        """
+        Generate predictions for eval_data, reusing cached predictions when possible
+        
+        Args:
+            model_uri: MLflow model URI
+            eval_data: Evaluation dataset with features and target
+            target_col: Target column name
+            data_hash: Precomputed data_fingerprint(eval_data) for the cache key
+            
+        Returns:
+            Array of predictions aligned with eval_data
+        """
+        if self.prediction_cache is not None and self.prediction_cache.is_cacheable(model_uri):
+            return self.prediction_cache.get_or_predict(
+                model_uri=model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+                data_hash=data_hash,
+            )
+
+        model = mlflow.pyfunc.load_model(model_uri)
+        return model.predict(eval_data.drop(columns=[target_col]))
+
+    def _evaluate(
+        self,
+        model_uri: str,
+        eval_data: pd.DataFrame,
+        target_col: str,
+        model_type: str,
+        evaluator_config: dict | None = None,
+        predictions: np.ndarray | None = None,
+    ):
+        """
+        Run mlflow.models.evaluate, reusing precomputed or cached predictions when possible
+
+        With predictions available MLflow evaluates a static dataset of targets
+        and predictions, so only metrics are computed. SHAP explainers need the
+        model itself and always evaluate it directly.
+        """
+        evaluator_config = evaluator_config or {}
+        if evaluator_config.get("log_explainer", False):
+            predictions = None
+        elif (
+            predictions is None
+            and self.prediction_cache is not None
+            and self.prediction_cache.is_cacheable(model_uri)
+        ):
+            predictions = self.prediction_cache.get_or_predict(
+                model_uri=model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+            )
+
+        if predictions is not None:
+            return mlflow.models.evaluate(
+                data=pd.DataFrame({
+                    target_col: eval_data[target_col].to_numpy(),
+                    PREDICTION_COL: predictions,
+                }),
+                targets=target_col,
+                predictions=PREDICTION_COL,
+                model_type=model_type,
+                evaluator_config=evaluator_config,
+            )
+
+        return mlflow.models.evaluate(
+            model=model_uri,
+            data=eval_data,
+            targets=target_col,
+            model_type=model_type,
+            evaluator_config=evaluator_config,
+        )
     
     def evaluate_model(
         self,
@@ -23,6 +183,7 @@ class ModelEvaluator:
         eval_data: pd.DataFrame,
         target_col: str,
         model_type: str = "classifier",
+        predictions: np.ndarray | None = None,
     ) -> dict:
         """
         Evaluate model using MLflow's evaluate API
@@ -32,6 +193,7 @@ class ModelEvaluator:
             eval_data: Evaluation dataset with features and target
             target_col: Target column name
             model_type: "classifier" or "regressor"
+            predictions: Precomputed predictions for eval_data, skips model inference
             
         Returns:
             Dictionary of evaluation metrics
@@ -48,14 +210,31 @@ class ModelEvaluator:
             evaluator_config["max_error_examples"] = self.config["shap"].get(
                 "max_samples", 100
             )
+
+            # The explainer cost grows with the number of rows, so large
+            # datasets get it on a sample while metrics use the full data.
+            # The sampled pass runs first so the full-data metrics are the
+            # last values logged to the run.
+            explainer_rows = self.config["shap"].get("max_samples_for_explainer", 1000)
+            if len(eval_data) > explainer_rows:
+                logger.info(f"Running SHAP explainer on a sample of {explainer_rows} rows")
+                self._evaluate(
+                    model_uri=model_uri,
+                    eval_data=eval_data.sample(n=explainer_rows, random_state=42),
+                    target_col=target_col,
+                    model_type=model_type,
+                    evaluator_config=evaluator_config,
+                )
+                evaluator_config = {}
         
         
-        self.evaluation_results = mlflow.models.evaluate(
-            model=model_uri,
-            data=eval_data,
-            targets=target_col,
+        self.evaluation_results = self._evaluate(
+            model_uri=model_uri,
+            eval_data=eval_data,
+            target_col=target_col,
             model_type=model_type,
             evaluator_config=evaluator_config,
+            predictions=predictions,
         )
         metrics = self.evaluation_results.metrics
         logger.info("Evaluation complete")
@@ -82,13 +261,14 @@ class ModelEvaluator:
         
         logger.info("Validating metrics against thresholds...")
 
-        thresholds = {}
-        for metric_name, threshold_value in thresholds_config.items():
-            if metric_name in metrics:
-                thresholds[metric_name] = MetricThreshold(
-                    threshold=threshold_value,
-                    greater_is_better=True
-                )
+        thresholds = {
+            metric_name: MetricThreshold(
+                threshold=threshold_value,
+                greater_is_better=True
+            )
+            for metric_name, threshold_value in thresholds_config.items()
+            if metric_name in metrics
+        }
         try:
             mlflow.validate_evaluation_results(
                 candidate_result=self.evaluation_results,#type:ignore
@@ -109,28 +289,61 @@ class ModelEvaluator:
         target_col: str,
     ) -> dict:
         logger.info("Comparing models...")
-        logger.info("Evaluating baseline model...")
-        
-        baseline_results = mlflow.models.evaluate(
-            model=baseline_model_uri,
-            data=eval_data,
-            targets=target_col,
-            model_type="classifier",
-        )
-        logger.info("Evaluating candidate model...")
-        candidate_results = mlflow.models.evaluate(
-            model=candidate_model_uri,
-            data=eval_data,
-            targets=target_col,
-            model_type="classifier",
-        )
+
+        # Hash the data once: it tags the run for provenance and keys the
+        # prediction cache for both models
+        data_hash = data_fingerprint(eval_data)
+        self.tracker.set_tag("eval_data_hash", data_hash)
+
+        if baseline_model_uri == candidate_model_uri:
+            logger.warning("Baseline and candidate are the same model, evaluating it once")
+            baseline_results = candidate_results = self._evaluate(
+                model_uri=baseline_model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+                model_type="classifier",
+                predictions=self.predict(baseline_model_uri, eval_data, target_col, data_hash),
+            )
+        else:
+            logger.info("Generating baseline and candidate predictions...")
+
+            # Model loading and inference for both models run concurrently.
+            # mlflow.models.evaluate logs to the thread-local active run, so the
+            # metric computation below stays on this thread.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                baseline_future = executor.submit(
+                    self.predict, baseline_model_uri, eval_data, target_col, data_hash
+                )
+                candidate_future = executor.submit(
+                    self.predict, candidate_model_uri, eval_data, target_col, data_hash
+                )
+                baseline_predictions = baseline_future.result()
+                candidate_predictions = candidate_future.result()
+
+            logger.info("Evaluating baseline model...")
+            baseline_results = self._evaluate(
+                model_uri=baseline_model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+                model_type="classifier",
+                predictions=baseline_predictions,
+            )
+            logger.info("Evaluating candidate model...")
+            candidate_results = self._evaluate(
+                model_uri=candidate_model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+                model_type="classifier",
+                predictions=candidate_predictions,
+            )
         
 
+        baseline_metrics = baseline_results.metrics
+        candidate_metrics = candidate_results.metrics
+
         comparison = {}
-        comparison_flat = {}
-        for metric in baseline_results.metrics.keys():
-            baseline_value = baseline_results.metrics.get(metric, 0)
-            candidate_value = candidate_results.metrics.get(metric, 0)
+        for metric, baseline_value in baseline_metrics.items():
+            candidate_value = candidate_metrics.get(metric, 0)
             improvement = candidate_value - baseline_value
 
             comparison[metric] = {
@@ -144,17 +357,22 @@ class ModelEvaluator:
 
         logger.info("Model comparison complete")
         for metric, values in comparison.items():
+            # Let loguru format the message, so nothing is formatted when INFO is filtered out
             logger.info(
-                f"{metric}: baseline={values['baseline']:.4f}, "
-                f"candidate={values['candidate']:.4f}, "
-                f"improvement={values['improvement']:+.4f} ({values['improvement_pct']:+.2f}%)"
+                "{}: baseline={:.4f}, candidate={:.4f}, improvement={:+.4f} ({:+.2f}%)",
+                metric,
+                values['baseline'],
+                values['candidate'],
+                values['improvement'],
+                values['improvement_pct'],
             )
         
         self.tracker.log_dict(comparison, f"model_comparision_baseline_{baseline_model_uri}_candicate_{candidate_model_uri}.json")
         
-        comparison_flat = {}
-        for metric, values in comparison.items():
-            comparison_flat[f"delta_{metric}"] = values["improvement"]
+        comparison_flat = {
+            f"delta_{metric}": values["improvement"]
+            for metric, values in comparison.items()
+        }
             
         self.tracker.log_metrics(comparison_flat) 
         
@@ -1,41 +1,257 @@
 """
 Docstring for model_pipeline.src.model.generic_trainer
 """
+import importlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import mlflow
-from mlflow.models import infer_signature
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.linear_model import LogisticRegression
+import pyarrow as pa
+import pyarrow.compute as pc
 from loguru import logger
 
 from src.mlflow_utils.experiment_tracker import ExperimentTracker
 
 
+def _encode_labels(encoder, values: np.ndarray) -> np.ndarray:
+    """
+    Equivalent of LabelEncoder.transform using a binary search on the sorted classes_
+    
+    Args:
+        encoder: Fitted LabelEncoder
+        values: Array of string labels
+        
+    Returns:
+        Array of integer codes
+    """
+    classes = encoder.classes_
+    try:
+        codes = np.searchsorted(classes, values)
+    except TypeError:
+        # Missing values that survived astype(str) don't compare with strings
+        return encoder.transform(values)
+    np.minimum(codes, len(classes) - 1, out=codes)
+    unseen = classes[codes] != values
+    if unseen.any():
+        raise ValueError(f"y contains previously unseen labels: {np.unique(values[unseen]).tolist()}")
+    return codes
+
+
+class CategoricalEncoder:
+    """
+    LabelEncoder-compatible encoder built on pandas Categorical
+    
+    classes_ holds the sorted categories, so fitted encoders work wherever a
+    fitted sklearn LabelEncoder is expected (including _encode_labels).
+    """
+
+    def __init__(self):
+        self.classes_ = None
+
+    @staticmethod
+    def _as_labels(values: pd.Series) -> pd.Series:
+        # Match LabelEncoder on .astype(str): missing values become the "nan"
+        # label and non-string categories are compared as strings
+        if pd.api.types.is_string_dtype(values) and not values.hasnans:
+            return values
+        return values.astype(str).fillna("nan")
+
+    def fit_transform(self, values: pd.Series) -> np.ndarray:
+        """Fit the categories and return the integer codes in a single hashing pass"""
+        categorical = pd.Categorical(self._as_labels(values))
+        self.classes_ = categorical.categories.to_numpy(dtype=object)
+        return categorical.codes
+
+    def fit(self, values: pd.Series) -> "CategoricalEncoder":
+        self.fit_transform(values)
+        return self
+
+    def transform(self, values: pd.Series) -> np.ndarray:
+        codes = pd.Categorical(self._as_labels(pd.Series(values)), categories=self.classes_).codes
+        if (codes < 0).any():
+            raise ValueError("y contains previously unseen labels")
+        return codes
+
+    def inverse_transform(self, codes: np.ndarray) -> np.ndarray:
+        return self.classes_[codes]
+
+
+def _fit_categorical_column(values: pd.Series) -> tuple[np.ndarray, CategoricalEncoder]:
+    """Dictionary-encode one column in Arrow and remap the codes to sorted categories"""
+    encoded = pc.dictionary_encode(pa.array(CategoricalEncoder._as_labels(values)))
+    order = pc.array_sort_indices(encoded.dictionary).to_numpy()
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+
+    encoder = CategoricalEncoder()
+    encoder.classes_ = encoded.dictionary.to_numpy(zero_copy_only=False).astype(object)[order]
+    return rank[encoded.indices.to_numpy()], encoder
+
+
+def fit_categorical_encoders(
+    data: pd.DataFrame,
+    columns: list[str],
+) -> tuple[dict[str, np.ndarray], dict[str, CategoricalEncoder]]:
+    """
+    Fit a CategoricalEncoder per column and encode it, one column per thread
+    
+    Arrow's dictionary encoding runs in C++ without the GIL, so the columns
+    are hashed in parallel.
+    
+    Args:
+        data: DataFrame holding the categorical columns
+        columns: Columns to encode
+        
+    Returns:
+        Tuple of (column -> integer codes, column -> fitted encoder)
+    """
+    if not columns:
+        return {}, {}
+
+    with ThreadPoolExecutor(max_workers=len(columns)) as executor:
+        results = list(executor.map(_fit_categorical_column, (data[col] for col in columns)))
+
+    codes = {col: col_codes for col, (col_codes, _) in zip(columns, results)}
+    encoders = {col: encoder for col, (_, encoder) in zip(columns, results)}
+    return codes, encoders
+
+
+# Name of the ONNX export in the logged pyfunc's artifacts
+ONNX_ARTIFACT_KEY = "onnx_model"
+
+
+def export_xgboost_onnx(model, n_features: int, path: str) -> bool:
+    """
+    Convert a fitted XGBClassifier to ONNX
+    
+    Args:
+        model: Fitted XGBClassifier
+        n_features: Number of input features
+        path: Output .onnx file
+        
+    Returns:
+        True if the model was exported, False if onnxmltools is unavailable
+        or the conversion failed
+    """
+    try:
+        from onnxmltools import convert_xgboost
+        from onnxmltools.convert.common.data_types import FloatTensorType
+    except ImportError:
+        logger.warning("onnxmltools not installed; skipping ONNX export")
+        return False
+
+    # The converter only understands the default f0..fN feature names
+    booster = model.get_booster().copy()
+    booster.feature_names = None
+    booster.feature_types = None
+    try:
+        onnx_model = convert_xgboost(
+            booster, initial_types=[('input', FloatTensorType([None, n_features]))]
+        )
+    except Exception as e:
+        logger.warning(f"ONNX export failed, serving the native model: {e}")
+        return False
+
+    with open(path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    return True
+
+
 class BinaryClassifierWrapper(mlflow.pyfunc.PythonModel):  #type:ignore
     """Generic wrapper for binary classification models"""
     
-    def __init__(self, model, model_type, feature_names, label_encoder=None, feature_encoders=None):
+    def __init__(
+        self,
+        model,
+        model_type,
+        feature_names,
+        label_encoder=None,
+        feature_encoders=None,
+        predict_batch_size=None,
+    ):
         self.model = model
         self.model_type = model_type
         self.feature_names = feature_names
         self.label_encoder = label_encoder
         self.feature_encoders = feature_encoders or {}
+        self.predict_batch_size = predict_batch_size
+
+    def load_context(self, context):
+        """Open an ONNX Runtime session when the model was logged with an ONNX export"""
+        self._onnx_session = None
+        onnx_path = (context.artifacts or {}).get(ONNX_ARTIFACT_KEY)
+        if not onnx_path:
+            return
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            logger.warning("onnxruntime not installed; predicting with the native model")
+            return
+
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = int(os.getenv("ORT_INTRA_OP_NUM_THREADS", "0"))
+        self._onnx_session = ort.InferenceSession(
+            onnx_path, sess_options=sess_options, providers=['CPUExecutionProvider']
+        )
+        self._onnx_input = self._onnx_session.get_inputs()[0].name
+        logger.info(f"Serving predictions with ONNX Runtime: {onnx_path}")
+
+    def _predict_positive_proba(self, X):
+        """Positive-class probabilities, computed in row chunks when predict_batch_size is set"""
+        # Set by load_context; models pickled before the ONNX export have none
+        session = getattr(self, '_onnx_session', None)
+        if session is not None:
+            _, probabilities = session.run(None, {self._onnx_input: X.to_numpy(dtype=np.float32)})
+            return np.asarray(probabilities)[:, 1]
+
+        if self.model_type == 'xgboost':
+            # inplace_predict reads the float32 array directly, skipping the
+            # DMatrix that XGBClassifier.predict_proba builds on every call
+            return self.model.get_booster().inplace_predict(X.to_numpy(dtype=np.float32))
+
+        # Models pickled before predict_batch_size existed predict in one pass
+        batch_size = getattr(self, 'predict_batch_size', None)
+        if not batch_size or len(X) <= batch_size:
+            return self.model.predict_proba(X)[:, 1]
+
+        probs = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), batch_size):
+            probs[start:start + batch_size] = self.model.predict_proba(
+                X.iloc[start:start + batch_size]
+            )[:, 1]
+        return probs
+
+    def _feature_positions(self, columns):
+        """Integer positions of feature_names in columns, cached per column layout"""
+        # Models pickled before this cache existed start with an empty one
+        cached = getattr(self, '_feature_positions_cache', None)
+        if cached is None or not cached[0].equals(columns):
+            positions = columns.get_indexer(self.feature_names)
+            if (positions < 0).any():
+                missing = [name for name, pos in zip(self.feature_names, positions) if pos < 0]
+                raise KeyError(f"Missing feature columns: {missing}")
+            cached = (columns, positions)
+            self._feature_positions_cache = cached
+        return cached[1]
 
     def predict(self, context, model_input, params=None):  #type:ignore
-        df = model_input.copy()
+        # Only the encoded columns are allocated; the rest of model_input is
+        # read without copying
+        X = model_input.take(self._feature_positions(model_input.columns), axis=1)
 
-        for col, encoder in self.feature_encoders.items():
-            if col in df.columns:
-                df[col] = encoder.transform(df[col].astype(str))
-        
-        X = df[self.feature_names]
+        cat_cols = [col for col in self.feature_encoders if col in X.columns]
+        if cat_cols:
+            raw = X[cat_cols].astype(str).to_numpy()
+            X = X.assign(**{
+                col: _encode_labels(self.feature_encoders[col], raw[:, i])
+                for i, col in enumerate(cat_cols)
+            })
         
         
-        probs = self.model.predict_proba(X)[:, 1]
+        probs = self._predict_positive_proba(X)
         
         
         if params is None:
@@ -44,13 +260,17 @@ class BinaryClassifierWrapper(mlflow.pyfunc.PythonModel):  #type:ignore
         return_probs = params.get('return_probs', False)
         return_both = params.get('return_both', False)
 
-        binary_preds = (probs >= 0.5).astype(int)
+        binary_preds = (probs >= 0.5).view(np.uint8)
         if self.label_encoder is not None:
-            final_preds = self.label_encoder.inverse_transform(binary_preds)
+            # Plain gather on the two fitted classes, skipping inverse_transform's validation
+            final_preds = self.label_encoder.classes_[binary_preds]
         else:
             final_preds = binary_preds
 
-        max_probs = np.maximum(probs, 1 - probs)
+        # max(p, 1 - p) == 0.5 + |p - 0.5|, computed in a single buffer
+        max_probs = np.subtract(probs, 0.5)
+        np.abs(max_probs, out=max_probs)
+        max_probs += 0.5
         
         if return_both:
             return pd.DataFrame({
@@ -66,10 +286,13 @@ class BinaryClassifierWrapper(mlflow.pyfunc.PythonModel):  #type:ignore
 class GenericBinaryClassifierTrainer:
     """Generic trainer for multiple binary classification algorithms"""
     
+    # (module, class) pairs, imported on first use so that importing this
+    # module (e.g. from eval.py or a model load) doesn't pull in every estimator
     SUPPORTED_MODELS = {
-        'random_forest': RandomForestClassifier,
-        'decision_tree': DecisionTreeClassifier,
-        'logistic_regression': LogisticRegression,
+        'random_forest': ('sklearn.ensemble', 'RandomForestClassifier'),
+        'decision_tree': ('sklearn.tree', 'DecisionTreeClassifier'),
+        'logistic_regression': ('sklearn.linear_model', 'LogisticRegression'),
+        'xgboost': ('xgboost', 'XGBClassifier'),
     }
     
     def __init__(
@@ -107,6 +330,8 @@ class GenericBinaryClassifierTrainer:
         X = data[feature_cols]
         y = data[target_col]
 
+        from sklearn.model_selection import train_test_split
+
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, random_state=random_state, stratify=y
         )
@@ -148,7 +373,8 @@ class GenericBinaryClassifierTrainer:
 
         mlflow.sklearn.autolog(log_models=False) #type:ignore
     
-        model_class = self.SUPPORTED_MODELS[self.model_type]
+        module_name, class_name = self.SUPPORTED_MODELS[self.model_type]
+        model_class = getattr(importlib.import_module(module_name), class_name)
   
         
         self.model = model_class(**params)
@@ -162,8 +388,10 @@ class GenericBinaryClassifierTrainer:
         logger.info(f"Train accuracy: {train_score:.4f}")
         logger.info(f"Test accuracy: {test_score:.4f}")
         
-        self.tracker.log_metric("train_accuracy", train_score)
-        self.tracker.log_metric("test_accuracy", test_score)
+        self.tracker.log_batch(metrics={
+            "train_accuracy": train_score,
+            "test_accuracy": test_score,
+        })
         
 
         self._log_feature_importance()
@@ -172,24 +400,25 @@ class GenericBinaryClassifierTrainer:
     
     def _log_feature_importance(self):
         """Log feature importance metrics based on model type"""
-        importance_dict = {}
+        importances = None
         
-        if self.model_type in ['random_forest', 'decision_tree']:
+        if self.model_type in ['random_forest', 'decision_tree', 'xgboost']:
             if hasattr(self.model, 'feature_importances_'):
-                importance_dict = dict(zip(self.feature_names, self.model.feature_importances_))#type:ignore
+                importances = np.asarray(self.model.feature_importances_)#type:ignore
         elif self.model_type == 'logistic_regression':
             if hasattr(self.model, 'coef_'):
-                importance_dict = dict(zip(self.feature_names, np.abs(self.model.coef_[0])))#type:ignore
-        
-        if importance_dict:
-            sorted_importance = sorted(
-                importance_dict.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+                importances = np.abs(self.model.coef_[0])#type:ignore
+        
+        if importances is not None and importances.size:
+            # Partial sort: select the top 10 in O(n), then order only those
+            top_k = min(10, importances.size)
+            top_idx = np.argpartition(importances, -top_k)[-top_k:]
+            top_idx = top_idx[np.argsort(-importances[top_idx], kind='stable')]
             
-            for feature, score in sorted_importance:
-                self.tracker.log_metric(f"feature_importance/{feature}", score)  #type:ignore
+            self.tracker.log_metrics({  #type:ignore
+                f"feature_importance/{self.feature_names[idx]}": float(importances[idx])#type:ignore
+                for idx in top_idx
+            })
             logger.info("Feature importance logged")
     
     def save_model(
@@ -200,6 +429,8 @@ class GenericBinaryClassifierTrainer:
         feature_encoders=None
     ):
         """Save model with wrapper for consistent prediction interface"""
+        from mlflow.models import infer_signature
+
         if self.model is None:
             raise ValueError("Model not trained.")
 
@@ -208,7 +439,8 @@ class GenericBinaryClassifierTrainer:
             model_type=self.model_type,
             feature_names=self.feature_names,
             label_encoder=label_encoder,
-            feature_encoders=feature_encoders
+            feature_encoders=feature_encoders,
+            predict_batch_size=self.config.get('predict_batch_size'),
         )
 
         prediction = wrapper.predict(context=None, model_input=input_example)
@@ -218,13 +450,24 @@ class GenericBinaryClassifierTrainer:
         logger.info(f"{SRC_PATH=}")
         
         logger.info(f"Saving {self.model_type} model as '{model_name}'...")
-        mlflow.pyfunc.log_model(
-            python_model=wrapper,
-            artifact_path=model_name,
-            signature=signature,
-            input_example=input_example.iloc[:3],
-            code_paths=[str(SRC_PATH / 'src')]
-        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # XGBoost models also ship an ONNX export that load_context serves
+            # through ONNX Runtime when it is installed
+            artifacts = None
+            onnx_path = os.path.join(tmp_dir, 'model.onnx')
+            if self.model_type == 'xgboost' and export_xgboost_onnx(
+                self.model, len(self.feature_names), onnx_path
+            ):
+                artifacts = {ONNX_ARTIFACT_KEY: onnx_path}
+
+            mlflow.pyfunc.log_model(
+                python_model=wrapper,
+                artifact_path=model_name,
+                signature=signature,
+                input_example=input_example.iloc[:3],
+                code_paths=[str(SRC_PATH / 'src')],
+                artifacts=artifacts
+            )
     
     # def load_model(self, model_uri: str):
     #     """Load a trained model from MLflow"""
@@ -4,13 +4,17 @@ Docstring for model_pipelinenene.src.scripts.eval
 import sys
 from pathlib import Path
 import argparse
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from loguru import logger
 import os
 import mlflow
 
 from src.model.evaluator import ModelEvaluator
-from src.model.xgboost_trainer import ExperimentTracker
+from src.mlflow_utils.experiment_tracker import ExperimentTracker
 from src.utility.helper import load_config
 
 # [IMPORTANT] SETUP docker, remember to get rid of these hardcoded!
@@ -25,44 +29,75 @@ def save_predictions_with_probabilities(
     eval_data: pd.DataFrame,
     target_col: str,
     output_path: str,
+    chunk_size: int = 50_000,
+    predictions: np.ndarray | None = None,
 ):
     """
-    Load model, generate predictions with probabilities, and save to CSV
+    Load model, generate predictions with probabilities, and save to CSV or Parquet
+    
+    Predictions are generated and appended to the output one chunk at a time,
+    so only a single chunk of output is held in memory. Paths ending in
+    .parquet or .pq are written as snappy-compressed Parquet, anything else
+    as CSV.
     
     Args:
         model_uri: MLflow model URI
         eval_data: Evaluation data including features and target
         target_col: Name of target column
-        output_path: Path to save predictions CSV
+        output_path: Path to save predictions CSV or Parquet file
+        chunk_size: Number of rows predicted and written per chunk
+        predictions: Precomputed predictions for eval_data, skips loading the model
     """
-    logger.info("Loading model for prediction...")
-    model = mlflow.pyfunc.load_model(model_uri)
+    if predictions is None:
+        logger.info("Loading model for prediction...")
+        model = mlflow.pyfunc.load_model(model_uri)
     
     feature_cols = [col for col in eval_data.columns if col != target_col]
-    X_eval = eval_data[feature_cols]
-    y_true = eval_data[target_col]
-    
-    logger.info(f"Generating predictions for {len(X_eval)} samples...")
-    
-    
-    y_pred = model.predict(X_eval) 
     
-    output_df = eval_data.copy()
-    output_df['prediction'] = y_pred
+    logger.info(f"Generating predictions for {len(eval_data)} samples...")
     
     output_path_obj = Path(output_path)
     output_path_obj.parent.mkdir(parents=True, exist_ok=True)
+    write_parquet = output_path_obj.suffix.lower() in ['.parquet', '.pq']
     
-    output_df.to_csv(output_path, index=False)
+    n_positives = 0
+    writer = None
+    try:
+        for start in range(0, len(eval_data), chunk_size):
+            chunk = eval_data.iloc[start:start + chunk_size]
+            if predictions is None:
+                y_pred = model.predict(chunk[feature_cols])
+            else:
+                y_pred = predictions[start:start + chunk_size]
+            n_positives += int(np.asarray(y_pred).sum())
+            output_chunk = chunk.assign(prediction=y_pred)
+
+            if write_parquet:
+                table = pa.Table.from_pandas(output_chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema, compression="snappy")
+                writer.write_table(table)
+            else:
+                first_chunk = start == 0
+                output_chunk.to_csv(
+                    output_path,
+                    mode="w" if first_chunk else "a",
+                    header=first_chunk,
+                    index=False,
+                )
+    finally:
+        if writer is not None:
+            writer.close()
     logger.info(f"Predictions saved to: {output_path}")
     
     logger.info(f"Prediction Summary:")
-    logger.info(f"  - Total samples: {len(output_df)}")
+    logger.info(f"  - Total samples: {len(eval_data)}")
 
-    logger.info(f"  - Predicted positives: {output_df['prediction'].sum()} ({output_df['prediction'].mean():.2%})")
+    positive_rate = n_positives / len(eval_data) if len(eval_data) else 0.0
+    logger.info(f"  - Predicted positives: {n_positives} ({positive_rate:.2%})")
 
     
-    return output_df
+    return output_path
 
 
 def main():
@@ -125,13 +160,23 @@ def main():
         "--output-path-prediction",
         type=str,
         default=None,
-        help="Path to save predictions CSV with probabilities (e.g., 'outputs/predictions.csv')",
+        help="Path to save predictions CSV or Parquet file (e.g., 'outputs/predictions.parquet')",
+    )
+
+    parser.add_argument(
+        "--skip-metrics",
+        action="store_true",
+        help="Only write predictions to --output-path-prediction, without computing metrics",
     )
 
     args = parser.parse_args()
 
     if not args.run_id and not args.model_uri:
         parser.error("Either --run-id or --model-uri must be provided")
+    if args.skip_metrics and not args.output_path_prediction:
+        parser.error("--skip-metrics requires --output-path-prediction")
+    if args.skip_metrics and args.validate_thresholds:
+        parser.error("--skip-metrics cannot be combined with --validate-thresholds")
     
     logger.info("Loading configuration...")
     config = load_config(args.config)
@@ -154,31 +199,48 @@ def main():
         artifact_location=config["mlflow"].get("artifact_location"),
     )
     
+    target_col = config["features"]["target_column"]
+    feature_cols = config["features"]["training_features"]
+
     logger.info(f"Loading evaluation data from {args.eval_data_path}")
     data_path = Path(args.eval_data_path)
 
     if data_path.suffix.lower() == '.csv':
-        eval_data = pd.read_csv(data_path)
+        # Arrow's multi-threaded parser only materializes the requested columns
+        eval_data = pacsv.read_csv(
+            data_path,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(include_columns=feature_cols + [target_col]),
+        ).to_pandas()
     elif data_path.suffix.lower() in ['.parquet', '.pq']:
-        eval_data = pd.read_parquet(data_path)
+        eval_data = pd.read_parquet(data_path, columns=feature_cols + [target_col])
     else:
         supported_formats = [".csv", ".parquet", ".pq"]
         raise ValueError(
             f"Unsupported file format: {data_path.suffix}. "
             f"Supported formats are: {supported_formats}"
         )
-    
-
-    cols_to_drop = [c for c in eval_data.columns if c.strip() == "" or "Unnamed" in c]
-    if cols_to_drop:
-        logger.warning(f"Dropping dirty columns from evaluation data: {cols_to_drop}")
-        eval_data = eval_data.drop(columns=cols_to_drop)
     logger.info(f"Loaded {len(eval_data)} samples with {len(eval_data.columns)} features")
 
-    target_col = config["features"]["target_column"]
-    feature_cols = config["features"]["training_features"]
-
-    eval_data = eval_data[feature_cols + [target_col]]
+    # When every feature is floating point, pack them into one C-ordered
+    # float32 block. Integer or categorical features are left alone: the model
+    # signature only accepts float32 -> double upcasts, not int -> float32.
+    if all(pd.api.types.is_float_dtype(eval_data[col]) for col in feature_cols):
+        features = np.ascontiguousarray(eval_data[feature_cols].to_numpy(dtype=np.float32))
+        eval_data = pd.DataFrame(features, columns=feature_cols, copy=False).assign(
+            **{target_col: eval_data[target_col].to_numpy()}
+        )
+    else:
+        # Otherwise downcast numeric features column by column; the model
+        # signature upcasts them back within the same kind
+        downcast = {}
+        for col in feature_cols:
+            if pd.api.types.is_float_dtype(eval_data[col]):
+                downcast[col] = eval_data[col].astype(np.float32)
+            elif pd.api.types.is_integer_dtype(eval_data[col]):
+                downcast[col] = pd.to_numeric(eval_data[col], downcast="integer")
+        if downcast:
+            eval_data = eval_data.assign(**downcast)
 
     
     evaluator = ModelEvaluator(
@@ -202,18 +264,28 @@ def main():
         target_col = config["features"]["target_column"]
         logger.info(f"Target column: {target_col=}")
         
-        logger.info("=" * 60)
-        logger.info("EVALUATING MODEL")
-        logger.info("=" * 60)
-        metrics = evaluator.evaluate_model(
-            model_uri=model_uri,
-            eval_data=eval_data,
-            target_col=target_col,
-            model_type=config["model"]["type"],
-         
-        )
+        # Prediction-only runs stream predictions straight to the output file
+        predictions = None
+        if not args.skip_metrics:
+            logger.info("=" * 60)
+            logger.info("EVALUATING MODEL")
+            logger.info("=" * 60)
+            # Predict once and share the result between metrics and the
+            # predictions output instead of running inference for each
+            predictions = evaluator.predict(
+                model_uri=model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+            )
+            metrics = evaluator.evaluate_model(
+                model_uri=model_uri,
+                eval_data=eval_data,
+                target_col=target_col,
+                model_type=config["model"]["type"],
+                predictions=predictions,
+            )
 
-        tracker.log_metrics(metrics)
+            tracker.log_metrics(metrics)
         
         if args.validate_thresholds:
             logger.info("=" * 60)
@@ -242,6 +314,7 @@ def main():
                     eval_data=eval_data,
                     target_col=target_col,
                     output_path=args.output_path_prediction,
+                    predictions=predictions,
                 )
                 
                 tracker.log_artifact(args.output_path_prediction)
@@ -251,12 +324,13 @@ def main():
                 logger.error(f"Failed to generate predictions: {e}")
                 raise
         
-        logger.info("=" * 60)
-        logger.info("EVALUATION SUMMARY")
-        logger.info("=" * 60)
+        if not args.skip_metrics:
+            logger.info("=" * 60)
+            logger.info("EVALUATION SUMMARY")
+            logger.info("=" * 60)
 
-        metrics_summary = evaluator.get_metrics_summary()
-        logger.info(f"\n{metrics_summary.to_string()}")
+            metrics_summary = evaluator.get_metrics_summary()
+            logger.info(f"\n{metrics_summary.to_string()}")
 
         logger.info("=" * 60)
         logger.info("EVALUATION COMPLETE")
@@ -3,18 +3,15 @@ Docstring for model_pipeline.src.scripts.train
 """
 from pathlib import Path
 import argparse
+import hashlib
+import joblib
 import pandas as pd
+import pyarrow.csv as pacsv
 import yaml
 from loguru import logger
 
-import pandas as pd
-import yaml
-from loguru import logger
-
-from sklearn.preprocessing import LabelEncoder
-
 from src.mlflow_utils.experiment_tracker import ExperimentTracker
-from src.model.xgboost_trainer import GenericBinaryClassifierTrainer
+from src.model.xgboost_trainer import GenericBinaryClassifierTrainer, fit_categorical_encoders
 from src.utility.helper import load_config
 import os
 
@@ -23,8 +20,75 @@ os.environ["AWS_SECRET_ACCESS_KEY"] = "minio123"
 os.environ["AWS_DEFAULT_REGION"] = "us-east-1"
 os.environ["MLFLOW_S3_ENDPOINT_URL"] = "http://localhost:9000"
 
+PREPROCESSING_CACHE_DIR = Path(".cache/training")
 
 
+def preprocessing_cache_paths(
+    data_path: Path,
+    feature_cols: list[str],
+    target_col: str,
+    cache_dir: Path = PREPROCESSING_CACHE_DIR,
+) -> tuple[Path, Path]:
+    """
+    Cache file paths for the encoded training data and its encoders
+    
+    The key covers everything preprocessing depends on: the data file
+    (path, size, mtime) and the selected columns. Model hyperparameters are
+    left out so parameter sweeps share one cache entry.
+    
+    Returns:
+        Tuple of (encoded data Parquet path, encoders joblib path)
+    """
+    stat = data_path.stat()
+    key = hashlib.sha1(
+        repr((
+            str(data_path.resolve()),
+            stat.st_size,
+            stat.st_mtime_ns,
+            feature_cols,
+            target_col,
+        )).encode()
+    ).hexdigest()
+    return cache_dir / f"{key}.parquet", cache_dir / f"{key}.joblib"
+
+
+def load_and_encode(
+    data_path: Path,
+    feature_cols: list[str],
+    target_col: str,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    """
+    Load the training data and encode its categorical columns
+    
+    Returns:
+        Tuple of (encoded data, raw input example rows, column -> encoder)
+    """
+    # Only the configured features and target are parsed/read
+    if data_path.suffix.lower() == '.csv':
+        data = pacsv.read_csv(
+            data_path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=64 << 20),
+            convert_options=pacsv.ConvertOptions(include_columns=feature_cols + [target_col]),
+        ).to_pandas()
+    elif data_path.suffix.lower() in ['.parquet', '.pq']:
+        data = pd.read_parquet(data_path, columns=feature_cols + [target_col])
+    else:
+        supported_formats = [".csv", ".parquet", ".pq"]
+        raise ValueError(
+            f"Unsupported file format: {data_path.suffix}. "
+            f"Supported formats are: {supported_formats}"
+        )
+    logger.info(f"Loaded {len(data)} samples with {len(data.columns)} features")
+
+    # Keep only the few raw rows used as the model input example instead of
+    # copying the whole frame before encoding
+    input_example = data[feature_cols].head(5).copy()
+    # preprocessing label encoder
+    cols_to_encode = data.select_dtypes(include=['object', 'category']).columns.tolist()
+    logger.info(f"Encoding columns: {cols_to_encode}")
+    codes, encoders = fit_categorical_encoders(data, cols_to_encode)
+    return data.assign(**codes), input_example, encoders
+
 
 def main():
     parser = argparse.ArgumentParser(description="Train XGBoost model")
@@ -37,8 +101,8 @@ def main():
     parser.add_argument(
         "--training-data-path",
         type=str,
-        default="data/training_data.csv",
-        help="Path to training data",
+        default="data/training_data.parquet",
+        help="Path to training data (.parquet preferred; convert CSVs with src.utility.convert_to_parquet)",
     )
 
     parser.add_argument(
@@ -53,6 +117,17 @@ def main():
         default=None,
         help="MLflow run name",
     )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default=None,
+        help="Training device for xgboost models, overrides model.parameters.device (e.g., 'cuda', 'cpu')",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read and re-encode the training data instead of using the preprocessing cache",
+    )
   
     args = parser.parse_args()
 
@@ -61,6 +136,8 @@ def main():
 
     if args.experiment_name:
         config["mlflow"]["experiment_name"] = args.experiment_name
+    if args.device:
+        config["model"]["parameters"]["device"] = args.device
     logger.info(f"Experiment name: {args.experiment_name}")
     
     logger.info("Initializing MLflow experiment tracker...")
@@ -70,33 +147,26 @@ def main():
         artifact_location=config["mlflow"].get("artifact_location"),
     )
 
+    target_col = config["features"]["target_column"]
+    feature_cols = config["features"]["training_features"]
+
     logger.info(f"Loading training data from {args.training_data_path=}")
     data_path = Path(args.training_data_path)
+    data_cache_path, encoders_cache_path = preprocessing_cache_paths(
+        data_path, feature_cols, target_col
+    )
 
-    if data_path.suffix.lower() == '.csv':
-        data = pd.read_csv(data_path)
-    elif data_path.suffix.lower() in ['.parquet', '.pq']:
-        data = pd.read_parquet(data_path)
+    if not args.no_cache and data_cache_path.exists() and encoders_cache_path.exists():
+        logger.info(f"Loading preprocessed training data from cache: {data_cache_path}")
+        data = pd.read_parquet(data_cache_path)
+        input_example, encoders = joblib.load(encoders_cache_path)
     else:
-        supported_formats = [".csv", ".parquet", ".pq"]
-        raise ValueError(
-            f"Unsupported file format: {data_path.suffix}. "
-            f"Supported formats are: {supported_formats}"
-        )
-    logger.info(f"Loaded {len(data)} samples with {len(data.columns)} features")
-
-    raw_data = data.copy()
-    # preprocessing label encoder
-    encoders = {}
-    target_col = config["features"]["target_column"]
-    feature_cols = config["features"]["training_features"]
-
-    cols_to_encode = data.select_dtypes(include=['object', 'category']).columns.tolist()
-    for col in cols_to_encode:
-        logger.info(f"Encoding column: {col}")
-        le = LabelEncoder()
-        data[col] = le.fit_transform(data[col].astype(str))
-        encoders[col] = le
+        data, input_example, encoders = load_and_encode(data_path, feature_cols, target_col)
+        if not args.no_cache:
+            data_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(data_cache_path, compression="zstd", index=False)
+            joblib.dump((input_example, encoders), encoders_cache_path)
+            logger.info(f"Cached preprocessed training data: {data_cache_path}")
     
     target_encoder = encoders.pop(target_col, None)
     feature_encoders = encoders
@@ -137,7 +207,7 @@ def main():
 
         trainer.save_model(
             model_name=config['model']['name'],
-            input_example=raw_data[feature_cols].head(5),
+            input_example=input_example,
             label_encoder=target_encoder,
             feature_encoders=feature_encoders
         )
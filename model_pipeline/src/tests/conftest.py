@@ -45,6 +45,9 @@ def reset_mlflow():
     Reset mlflow state between run
     """
     import mlflow
+    from src.mlflow_utils.experiment_tracker import _get_client, _resolve_experiment_id
+    _get_client.cache_clear()
+    _resolve_experiment_id.cache_clear()
     try:
         mlflow.end_run()
     except:
@@ -58,20 +61,12 @@ def reset_mlflow():
 
 @pytest.fixture(scope='session', autouse=True)
 def setup_test_env():
-    original_env = os.environ.copy()
-    
-    # Set test environment variables
-    os.environ["AWS_ACCESS_KEY_ID"] = "test_key"
-    os.environ["AWS_SECRET_ACCESS_KEY"] = "test_secret"
-    os.environ["MLFLOW_S3_ENDPOINT_URL"] = "http://localhost:9000"
-    os.environ["MLFLOW_TRACKING_URI"] = "http://localhost:5000"
-    
-    yield
-    
-    # Restore original environment
-    os.environ.clear()
-    os.environ.update(original_env)
-    
-
-
-
+    # Session-scoped MonkeyPatch: only the keys set here are restored at the end
+    with pytest.MonkeyPatch.context() as mp:
+        # Set test environment variables
+        mp.setenv("AWS_ACCESS_KEY_ID", "test_key")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "test_secret")
+        mp.setenv("MLFLOW_S3_ENDPOINT_URL", "http://localhost:9000")
+        mp.setenv("MLFLOW_TRACKING_URI", "http://localhost:5000")
+        
+        yield
@@ -0,0 +1,63 @@
+import pytest
+from unittest.mock import Mock, patch
+import numpy as np
+import pandas as pd
+from src.model.evaluator import ModelEvaluator, PREDICTION_COL
+
+
+
+class TestModelEvaluator:
+
+    @pytest.fixture
+    def eval_data(self):
+        return pd.DataFrame({
+            "age": [25.0, 40.0, 58.0],
+            "gender": ["Male", "Female", "Male"],
+            "churned": [0, 1, 1],
+        })
+
+    @patch('src.model.evaluator.mlflow')
+    def test_predictions_are_cached_per_model_uri(self, mock_mlflow, eval_data, tmp_path):
+        mock_mlflow.pyfunc.load_model.return_value.predict.return_value = np.array([0, 1, 0])
+        evaluator = ModelEvaluator(
+            config={"cache": {"dir": str(tmp_path)}},
+            experiment_tracker=Mock(),
+        )
+
+        evaluator.evaluate_model("runs:/abc/model", eval_data, "churned")
+        evaluator.evaluate_model("runs:/abc/model", eval_data, "churned")
+
+        mock_mlflow.pyfunc.load_model.assert_called_once_with("runs:/abc/model")
+        kwargs = mock_mlflow.models.evaluate.call_args.kwargs
+        assert kwargs["predictions"] == PREDICTION_COL
+        assert kwargs["data"][PREDICTION_COL].tolist() == [0, 1, 0]
+        assert "model" not in kwargs
+
+    @patch('src.model.evaluator.mlflow')
+    def test_alias_uri_is_not_cached(self, mock_mlflow, eval_data, tmp_path):
+        evaluator = ModelEvaluator(
+            config={"cache": {"dir": str(tmp_path)}},
+            experiment_tracker=Mock(),
+        )
+
+        evaluator.evaluate_model("models:/churn@champion", eval_data, "churned")
+
+        mock_mlflow.pyfunc.load_model.assert_not_called()
+        assert mock_mlflow.models.evaluate.call_args.kwargs["model"] == "models:/churn@champion"
+        assert not any(tmp_path.iterdir())
+
+    @patch('src.model.evaluator.mlflow')
+    def test_precomputed_predictions_skip_inference(self, mock_mlflow, eval_data, tmp_path):
+        evaluator = ModelEvaluator(
+            config={"cache": {"dir": str(tmp_path)}},
+            experiment_tracker=Mock(),
+        )
+
+        evaluator.evaluate_model(
+            "models:/churn@champion", eval_data, "churned", predictions=np.array([1, 1, 0])
+        )
+
+        mock_mlflow.pyfunc.load_model.assert_not_called()
+        kwargs = mock_mlflow.models.evaluate.call_args.kwargs
+        assert kwargs["data"]["churned"].tolist() == [0, 1, 1]
+        assert kwargs["data"][PREDICTION_COL].tolist() == [1, 1, 0]
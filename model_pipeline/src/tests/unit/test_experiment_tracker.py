@@ -3,3 +3,80 @@ from unittest.mock import Mock, patch, MagicMock
 import mlflow
 from src.mlflow_utils.experiment_tracker import ExperimentTracker
 
+
+
+class TestExperimentTracker:
+
+    @patch('src.mlflow_utils.experiment_tracker.mlflow')
+    def test_experiment_lookup_is_cached(self, mock_mlflow):
+        mock_exp = Mock()
+        mock_exp.experiment_id = 'test_exp_id'
+        mock_mlflow.get_experiment_by_name.return_value = mock_exp
+
+        first = ExperimentTracker(
+            tracking_uri="http://localhost:5000",
+            experiment_name="cached_experiment"
+        )
+        second = ExperimentTracker(
+            tracking_uri="http://localhost:5000",
+            experiment_name="cached_experiment"
+        )
+
+        assert first.experiment_id == second.experiment_id == 'test_exp_id'
+        assert first.client is second.client
+        mock_mlflow.get_experiment_by_name.assert_called_once_with("cached_experiment")
+
+    @patch('src.mlflow_utils.experiment_tracker.mlflow')
+    def test_log_batch_sends_single_request(self, mock_mlflow):
+        mock_exp = Mock()
+        mock_exp.experiment_id = 'test_exp_id'
+        mock_mlflow.get_experiment_by_name.return_value = mock_exp
+        mock_mlflow.active_run.return_value.info.run_id = 'test_run_id'
+
+        tracker = ExperimentTracker(
+            tracking_uri="http://localhost:5000",
+            experiment_name="batch_experiment"
+        )
+        with patch.object(tracker, 'client') as mock_client:
+            tracker.log_batch(
+                metrics={"accuracy": 0.9, "f1_score": 0.8},
+                params={"max_depth": 5},
+                step=2,
+            )
+
+        mock_client.log_batch.assert_called_once()
+        kwargs = mock_client.log_batch.call_args.kwargs
+        assert kwargs["run_id"] == 'test_run_id'
+        assert {m.key: (m.value, m.step) for m in kwargs["metrics"]} == {
+            "accuracy": (0.9, 2),
+            "f1_score": (0.8, 2),
+        }
+        assert [(p.key, p.value) for p in kwargs["params"]] == [("max_depth", "5")]
+        assert kwargs["tags"] == []
+
+    @patch('src.mlflow_utils.experiment_tracker.mlflow')
+    def test_logging_is_queued_until_flush(self, mock_mlflow):
+        mock_exp = Mock()
+        mock_exp.experiment_id = 'test_exp_id'
+        mock_mlflow.get_experiment_by_name.return_value = mock_exp
+        mock_mlflow.active_run.return_value.info.run_id = 'test_run_id'
+
+        tracker = ExperimentTracker(
+            tracking_uri="http://localhost:5000",
+            experiment_name="queued_experiment"
+        )
+        with patch.object(tracker, 'client') as mock_client:
+            tracker.log_params({"max_depth": 5})
+            tracker.log_metric("accuracy", 0.9)
+            tracker.set_tag("stage", "dev")
+            mock_client.log_batch.assert_not_called()
+
+            tracker.flush()
+            tracker.flush()
+
+        mock_client.log_batch.assert_called_once()
+        kwargs = mock_client.log_batch.call_args.kwargs
+        assert [m.key for m in kwargs["metrics"]] == ["accuracy"]
+        assert [p.key for p in kwargs["params"]] == ["max_depth"]
+        assert [(t.key, t.value) for t in kwargs["tags"]] == [("stage", "dev")]
+        mock_mlflow.log_metric.assert_not_called()
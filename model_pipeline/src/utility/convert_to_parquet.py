@@ -0,0 +1,72 @@
+"""
+Docstring for model_pipeline.src.utility.convert_to_parquet
+One-off conversion of CSV training/evaluation data to Parquet
+"""
+import argparse
+from pathlib import Path
+
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from loguru import logger
+
+
+def convert_csv_to_parquet(
+    csv_path: str | Path,
+    parquet_path: str | Path | None = None,
+    row_group_size: int = 200_000,
+) -> Path:
+    """
+    Stream a CSV file into a zstd-compressed Parquet file
+
+    Args:
+        csv_path: Source CSV file
+        parquet_path: Output path (default: csv_path with a .parquet suffix)
+        row_group_size: Maximum rows per Parquet row group
+
+    Returns:
+        Path of the written Parquet file
+    """
+    csv_path = Path(csv_path)
+    parquet_path = Path(parquet_path) if parquet_path else csv_path.with_suffix(".parquet")
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=64 << 20),
+    )
+
+    num_rows = 0
+    with pq.ParquetWriter(
+        parquet_path,
+        reader.schema,
+        compression="zstd",
+        use_dictionary=True,
+    ) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=row_group_size)
+            num_rows += batch.num_rows
+
+    logger.info(f"Converted {num_rows} rows: {csv_path} -> {parquet_path}")
+    return parquet_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a CSV dataset to Parquet")
+    parser.add_argument(
+        "csv_path",
+        type=str,
+        help="Path to the CSV file",
+    )
+    parser.add_argument(
+        "--output-path",
+        type=str,
+        default=None,
+        help="Path to the Parquet file (default: CSV path with .parquet suffix)",
+    )
+    args = parser.parse_args()
+
+    convert_csv_to_parquet(args.csv_path, args.output_path)
+
+
+if __name__ == "__main__":
+    main()
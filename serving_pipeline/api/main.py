@@ -3,8 +3,10 @@ FastAPI main application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from routers import predict, health, monitor
+from pre_processing import flush_production_data
 import logging
 from dotenv import load_dotenv
 load_dotenv()
@@ -22,11 +24,19 @@ async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup
     logger.info("Starting Customer Churn Prediction API...")
-    logger.info("Model loaded successfully")
+    # Pay the model download/deserialization at boot, not on the first request
+    try:
+        app.state.model = predict.get_model()
+        logger.info("Model loaded successfully")
+    except Exception as e:
+        logger.error(f"Model pre-load failed, will retry on first request: {str(e)}")
     logger.info("API ready to serve predictions")
     yield
     # Shutdown
     logger.info("Shutting down API...")
+    await predict.batcher.stop()
+    monitor.shutdown_drift_executor()
+    flush_production_data()
 
 
 # Create FastAPI app
@@ -36,6 +46,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -54,6 +65,12 @@ app.include_router(health.router)
 app.include_router(monitor.router)
 
 
+@app.get("/metrics")
+async def metrics():
+    """Serving metrics"""
+    return {"prediction_cache": predict.prediction_cache_stats()}
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
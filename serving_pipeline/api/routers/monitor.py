@@ -5,17 +5,229 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel, Field
 from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
 import logging
 import os
+import time
 from datetime import datetime
 
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from monitoring import generate_drift_report, load_reference_data, load_current_data
+from monitoring import generate_drift_report, load_reference_data, load_current_data, DRIFT_FEATURES
+from monitoring import downsample_for_drift, MAX_DRIFT_SAMPLES
 from api.schemas import DriftMetricsResponse
 router = APIRouter(prefix="/monitor", tags=["Monitoring"])
 logger = logging.getLogger(__name__)
 
+# Seconds a drift report is reused before it is recomputed
+DRIFT_CACHE_TTL_SEC = float(os.getenv("DRIFT_CACHE_TTL_SEC", "300"))
+DRIFT_CACHE_SIZE = 32
+
+# Evidently runs are CPU-bound, so they go to a worker process to keep the
+# event loop (and prediction traffic) responsive
+_drift_executor: Optional[ProcessPoolExecutor] = None
+# (ref_path, ref_mtime_ns, curr_path, days, format) -> (time computed, result)
+_drift_cache: dict[tuple, tuple[float, tuple[dict, Optional[str]]]] = {}
+# Reports being computed, so concurrent identical checks share one run
+_drift_inflight: dict[tuple, asyncio.Future] = {}
+
+
+def _get_drift_executor() -> ProcessPoolExecutor:
+    global _drift_executor
+    if _drift_executor is None:
+        _drift_executor = ProcessPoolExecutor(max_workers=1)
+    return _drift_executor
+
+
+def shutdown_drift_executor():
+    """Stop the drift report worker process"""
+    global _drift_executor
+    if _drift_executor is not None:
+        _drift_executor.shutdown(wait=False, cancel_futures=True)
+        _drift_executor = None
+
+
+def _run_drift_report(
+    ref_path: str,
+    curr_path: str,
+    days: int,
+    format: str,
+    save_html: bool = False
+) -> tuple[dict, Optional[str]]:
+    """
+    Load both datasets and run the Evidently drift report
+    
+    Runs in the drift worker process; HTTPExceptions are raised with
+    positional arguments so they survive pickling back to the API.
+    
+    Returns:
+        Tuple of (drift metrics, HTML content or None for json format)
+    """
+    logger.info(f"Loading reference data from: {ref_path}")
+    logger.info(f"Loading current data from: {curr_path} (last {days} days)")
+    
+    # Feature columns for drift monitoring
+    feature_columns = DRIFT_FEATURES
+    load_columns = feature_columns + ['Churn', 'prediction']
+    
+    # Load data (only the columns used below are parsed)
+    try:
+        reference_df = load_reference_data(ref_path, columns=load_columns)
+        current_df = load_current_data(curr_path, days=days, columns=load_columns)
+    except FileNotFoundError as e:
+        raise HTTPException(404, str(e))
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    
+    logger.info(f"Reference data shape: {reference_df.shape}")
+    logger.info(f"Current data shape: {current_df.shape}")
+    
+    # Filter to only existing columns
+    existing_features = [col for col in feature_columns if col in reference_df.columns and col in current_df.columns]
+    
+    if not existing_features:
+        raise HTTPException(
+            400,
+            "No common feature columns found between reference and current data"
+        )
+    
+    logger.info(f"Monitoring drift for features: {existing_features}")
+    
+    # Prepare data for drift analysis
+    ref_data = reference_df[existing_features].copy()
+    curr_data = current_df[existing_features].copy()
+    
+    #  Proper classification metrics setup
+    include_classification = False
+    
+    # Check if we can do classification metrics
+    #  need BOTH target AND prediction in BOTH datasets
+    has_ref_target = 'Churn' in reference_df.columns
+    has_ref_prediction = 'prediction' in reference_df.columns
+    has_curr_target = 'Churn' in current_df.columns  
+    has_curr_prediction = 'prediction' in current_df.columns
+    
+    if has_ref_target and has_ref_prediction and has_curr_target and has_curr_prediction:
+        # Both datasets have ground truth and predictions
+        logger.info("Classification metrics available: Both datasets have target and prediction")
+        ref_data['target'] = reference_df['Churn']
+        ref_data['prediction'] = reference_df['prediction']
+        curr_data['target'] = current_df['Churn']
+        curr_data['prediction'] = current_df['prediction']
+        include_classification = True
+        
+    elif has_ref_prediction and has_curr_prediction:
+        #  Only prediction drift (no performance metrics)
+        logger.info("Prediction drift only: No ground truth in production data")
+        # Just monitor prediction distribution drift
+        ref_data['prediction'] = reference_df['prediction']
+        curr_data['prediction'] = current_df['prediction']
+        # Don't set target - Evidently will only compute prediction drift
+        include_classification = False
+        
+    else:
+        logger.info("No classification metrics: Missing prediction columns")
+    
+    # Generate HTML report path if needed
+    html_path = None
+    if save_html or format == "html":
+        reports_dir = "reports/drift"
+        os.makedirs(reports_dir, exist_ok=True)
+        timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+        html_path = f"{reports_dir}/drift_report_{timestamp_str}.html"
+    
+    # Generate drift report
+    metrics = generate_drift_report(
+        current_df=curr_data,
+        reference_df=ref_data,
+        output_path=html_path if save_html else None,
+        include_classification=include_classification
+    )
+    
+    # Render HTML if requested
+    html_content = None
+    if format == "html":
+        try:
+            from evidently.report import Report
+            from evidently.metric_preset import DataDriftPreset, ClassificationPreset
+        except ImportError as e:
+            raise HTTPException(
+                500,
+                f"Failed to import Evidently AI: {str(e)}"
+            )
+        
+        # Build metrics list
+        metrics_list = [DataDriftPreset()]
+        if include_classification:
+            metrics_list.append(ClassificationPreset())
+        
+        report = Report(metrics=metrics_list)
+        report.run(
+            reference_data=downsample_for_drift(ref_data, MAX_DRIFT_SAMPLES, "reference"),
+            current_data=downsample_for_drift(curr_data, MAX_DRIFT_SAMPLES, "current"),
+            column_mapping=None
+        )
+        # Rendered in memory, no temp file round-trip
+        html_content = report.get_html()
+    
+    metrics['reference_data_size'] = len(reference_df)
+    metrics['current_data_size'] = len(current_df)
+    return metrics, html_content
+
+
+async def _run_in_worker(
+    ref_path: str,
+    curr_path: str,
+    days: int,
+    format: str,
+    save_html: bool = False
+) -> tuple[dict, Optional[str]]:
+    """Run _run_drift_report in the drift worker process"""
+    global _drift_executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_drift_executor(), _run_drift_report,
+            ref_path, curr_path, days, format, save_html
+        )
+    except BrokenProcessPool:
+        # The worker died (e.g. OOM); start a fresh one on the next request
+        _drift_executor = None
+        raise
+
+
+async def _cached_drift_report(
+    ref_path: str,
+    ref_mtime_ns: int,
+    curr_path: str,
+    days: int,
+    format: str
+) -> tuple[dict, Optional[str]]:
+    """
+    Drift report reused for DRIFT_CACHE_TTL_SEC, or until the reference file
+    changes. Production data is appended continuously, so the current data
+    is refreshed by the TTL rather than by its mtime.
+    """
+    key = (ref_path, ref_mtime_ns, curr_path, days, format)
+    cached = _drift_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < DRIFT_CACHE_TTL_SEC:
+        return cached[1]
+    
+    task = _drift_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_run_in_worker(ref_path, curr_path, days, format))
+        _drift_inflight[key] = task
+        task.add_done_callback(lambda _: _drift_inflight.pop(key, None))
+    # Shielded so one client disconnecting does not cancel the shared run
+    result = await asyncio.shield(task)
+    
+    _drift_cache.pop(key, None)
+    _drift_cache[key] = (time.monotonic(), result)
+    while len(_drift_cache) > DRIFT_CACHE_SIZE:
+        _drift_cache.pop(next(iter(_drift_cache)))
+    return result
 
 
 @router.get("/drift", response_model=DriftMetricsResponse)
@@ -40,124 +252,28 @@ async def check_drift(
         ref_path = reference_path or "/home/mlops/Repository/aio2025-mlops-project01/serving_pipeline/original_data/reference_data.csv"
         curr_path = current_path or "/home/mlops/Repository/aio2025-mlops-project01/serving_pipeline/original_data/current_data.csv"
         
-        logger.info(f"Loading reference data from: {ref_path}")
-        logger.info(f"Loading current data from: {curr_path} (last {days} days)")
-        
-        # Load data
+        # The reference file's mtime invalidates cached reports when it changes
         try:
-            reference_df = load_reference_data(ref_path)
-            current_df = load_current_data(curr_path, days=days)
-            print(reference_df.head())
+            ref_mtime_ns = os.stat(ref_path).st_mtime_ns
+            os.stat(curr_path)
         except FileNotFoundError as e:
-            raise HTTPException(status_code=404, detail=str(e))
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        
-        logger.info(f"Reference data shape: {reference_df.shape}")
-        logger.info(f"Current data shape: {current_df.shape}")
-        
-        # Define feature columns for drift monitoring
-        feature_columns = [
-            'Age', 'Gender', 'Tenure', 'Usage_Frequency', 'Support_Calls',
-            'Payment_Delay', 'Subscription_Type', 'Contract_Length',
-            'Total_Spend', 'Last_Interaction'
-        ]
-        
-        # Filter to only existing columns
-        existing_features = [col for col in feature_columns if col in reference_df.columns and col in current_df.columns]
+            raise HTTPException(status_code=404, detail=f"Data not found: {e.filename}")
         
-        if not existing_features:
-            raise HTTPException(
-                status_code=400, 
-                detail="No common feature columns found between reference and current data"
+        if save_html:
+            # Saving a new report file is an explicit request for a fresh run
+            metrics, html_content = await _run_in_worker(
+                ref_path, curr_path, days, format, save_html=True
             )
-        
-        logger.info(f"Monitoring drift for features: {existing_features}")
-        
-        # Prepare data for drift analysis
-        ref_data = reference_df[existing_features].copy()
-        curr_data = current_df[existing_features].copy()
-        
-        #  Proper classification metrics setup
-        include_classification = False
-        
-        # Check if we can do classification metrics
-        #  need BOTH target AND prediction in BOTH datasets
-        has_ref_target = 'Churn' in reference_df.columns
-        has_ref_prediction = 'prediction' in reference_df.columns
-        has_curr_target = 'Churn' in current_df.columns  
-        has_curr_prediction = 'prediction' in current_df.columns
-        
-        if has_ref_target and has_ref_prediction and has_curr_target and has_curr_prediction:
-            # Both datasets have ground truth and predictions
-            logger.info("Classification metrics available: Both datasets have target and prediction")
-            ref_data['target'] = reference_df['Churn']
-            ref_data['prediction'] = reference_df['prediction']
-            curr_data['target'] = current_df['Churn']
-            curr_data['prediction'] = current_df['prediction']
-            include_classification = True
-            
-        elif has_ref_prediction and has_curr_prediction:
-            #  Only prediction drift (no performance metrics)
-            logger.info("Prediction drift only: No ground truth in production data")
-            # Just monitor prediction distribution drift
-            ref_data['prediction'] = reference_df['prediction']
-            curr_data['prediction'] = current_df['prediction']
-            # Don't set target - Evidently will only compute prediction drift
-            include_classification = False
-            
         else:
-            logger.info("No classification metrics: Missing prediction columns")
-        
-        # Generate HTML report path if needed
-        html_path = None
-        if save_html or format == "html":
-            reports_dir = "reports/drift"
-            os.makedirs(reports_dir, exist_ok=True)
-            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-            html_path = f"{reports_dir}/drift_report_{timestamp_str}.html"
-        
-        # Generate drift report
-        metrics = generate_drift_report(
-            current_df=curr_data,
-            reference_df=ref_data,
-            output_path=html_path if save_html else None,
-            include_classification=include_classification
-        )
+            metrics, html_content = await _cached_drift_report(
+                ref_path, ref_mtime_ns, curr_path, days, format
+            )
         
-        # Add metadata
-        metrics['reference_data_size'] = len(reference_df)
-        metrics['current_data_size'] = len(current_df)
-        metrics['timestamp'] = datetime.now().isoformat()
+        # Add metadata (copy so the cached metrics are not mutated)
+        metrics = {**metrics, 'timestamp': datetime.now().isoformat()}
         
         # Return HTML if requested
         if format == "html":
-            temp_path = f"/tmp/drift_report_{datetime.now().timestamp()}.html"
-            
-            try:
-                from evidently.report import Report
-                from evidently.metric_preset import DataDriftPreset, ClassificationPreset
-            except ImportError as e:
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"Failed to import Evidently AI: {str(e)}"
-                )
-            
-            # Build metrics list
-            metrics_list = [DataDriftPreset()]
-            if include_classification:
-                metrics_list.append(ClassificationPreset())
-            
-            report = Report(metrics=metrics_list)
-            report.run(reference_data=ref_data, current_data=curr_data, column_mapping=None)
-            report.save_html(temp_path)
-            
-            with open(temp_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            
             return HTMLResponse(content=html_content)
         
         # Return JSON metrics
@@ -6,68 +6,243 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from api.schemas import ChurnInput, ChurnPrediction
-from pre_processing import validate_input, save_production_data, map_schema_to_preprocessing
+from pre_processing import (
+    validate_input,
+    validate_frame,
+    save_production_data,
+    save_production_data_batch,
+    SCHEMA_TO_PREPROCESSING,
+    FLOAT_COLUMNS,
+)
 from load_model import load_model
+import asyncio
 import logging
+import threading
+import numpy as np
 import pandas as pd
 from typing import List
+from cachetools import LRUCache
 from dotenv import load_dotenv
 load_dotenv()
 
 router = APIRouter(prefix="/predict", tags=["Prediction"])
 logger = logging.getLogger(__name__)
 
-# Model will be loaded lazily on first use
+# Model is pre-loaded at app startup (see main.lifespan), lazily otherwise
 _model = None
+_model_lock = threading.Lock()
 MODEL_URI = os.getenv("MODEL_URI")
 if MODEL_URI is None:
     raise ValueError("MODEL_URI environment variable not set")
 
+# Column layout resolved once at import instead of per request
+_SCHEMA_COLS = list(SCHEMA_TO_PREPROCESSING)
+_MODEL_COLS = list(SCHEMA_TO_PREPROCESSING.values())
+# Numeric columns get a fixed numpy dtype (FLOAT_COLUMNS as float64, other
+# int/float fields from their ChurnInput annotation); categoricals stay inferred
+_COLUMN_DTYPES = [
+    np.float64 if model_col in FLOAT_COLUMNS
+    else {int: np.int64, float: np.float64}.get(ChurnInput.model_fields[schema_col].annotation)
+    for schema_col, model_col in SCHEMA_TO_PREPROCESSING.items()
+]
+
+
+def to_model_input(rows: List[list]) -> pd.DataFrame:
+    """
+    Build the model input DataFrame from rows of ChurnInput values
+
+    Args:
+        rows: Row values ordered like SCHEMA_TO_PREPROCESSING
+
+    Returns:
+        DataFrame with preprocessing column names and float columns cast
+    """
+    # Column-wise construction with known dtypes: no per-row dtype inference
+    # and no separate astype pass
+    return pd.DataFrame({
+        col: np.array(values, dtype=dtype) if dtype is not None else list(values)
+        for col, dtype, values in zip(_MODEL_COLS, _COLUMN_DTYPES, zip(*rows))
+    })
+
+
+def _row_values(data: ChurnInput) -> list:
+    """Field values in SCHEMA_TO_PREPROCESSING order, without a model_dump() round-trip"""
+    return [getattr(data, col) for col in _SCHEMA_COLS]
+
+
+def _prepare_df(rows: List[list]) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Map, cast and validate request rows in one columnar pass
+
+    Returns:
+        Tuple of (model input DataFrame for all rows, boolean mask of valid rows)
+    """
+    df = to_model_input(rows)
+    return df, validate_frame(df)
+
+
+def _validation_error(values: list) -> str:
+    """Detailed validation message for a row rejected by _prepare_df"""
+    return validate_input(dict(zip(_MODEL_COLS, values)))[1]
+
+
+# Predictions are deterministic per input row, so repeated customer profiles
+# are served from an LRU keyed on the row values
+_prediction_cache: LRUCache = LRUCache(maxsize=10_000)
+_prediction_cache_lock = threading.Lock()
+_prediction_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_predictions(keys: List[tuple]) -> List:
+    """Cached prediction per key (None on a miss), counting hits and misses"""
+    with _prediction_cache_lock:
+        cached = [_prediction_cache.get(key) for key in keys]
+        hits = sum(pred is not None for pred in cached)
+        _prediction_cache_stats["hits"] += hits
+        _prediction_cache_stats["misses"] += len(keys) - hits
+    return cached
+
+
+def _store_predictions(keys: List[tuple], predictions: List[int]):
+    with _prediction_cache_lock:
+        for key, prediction in zip(keys, predictions):
+            _prediction_cache[key] = prediction
+
+
+def prediction_cache_stats() -> dict:
+    """Hit/miss counters and current size of the prediction cache"""
+    with _prediction_cache_lock:
+        hits, misses = _prediction_cache_stats["hits"], _prediction_cache_stats["misses"]
+        size = len(_prediction_cache)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "size": size,
+        "maxsize": _prediction_cache.maxsize,
+    }
+
 
 def get_model():
-    """Lazy load model - only load when needed"""
+    """Load the model once; concurrent first callers wait for the same load"""
     global _model
     if _model is None:
-        logger.info("Loading model from MLflow...")
-        _model = load_model(model_uri=MODEL_URI)
-        logger.info("Model loaded successfully")
+        with _model_lock:
+            if _model is None:
+                logger.info("Loading model from MLflow...")
+                _model = load_model(model_uri=MODEL_URI)
+                logger.info("Model loaded successfully")
     return _model
 
 
+# Dynamic micro-batching of concurrent single-row requests
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("MAX_WAIT_MS", "10"))
+MAX_QUEUE_SIZE = int(os.getenv("MAX_QUEUE_SIZE", "1024"))
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one model.predict call
+    
+    Requests wait at most max_wait_ms for others to join a batch of up to
+    max_batch_size rows. The model runs in a worker thread so the event loop
+    keeps accepting requests meanwhile. A full queue is rejected right away
+    (the caller returns HTTP 429) instead of growing latency without bound.
+    """
+    
+    def __init__(self, max_batch_size: int, max_wait_ms: float, max_queue_size: int):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+    
+    def start(self):
+        """Start the batching loop on the running event loop"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def predict(self, values: list) -> int:
+        """
+        Queue one row and wait for its prediction
+        
+        Raises:
+            asyncio.QueueFull: If the queue is at capacity
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((values, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            rows = [values for values, _ in batch]
+            try:
+                predictions = await asyncio.to_thread(
+                    lambda: get_model().predict(to_model_input(rows))
+                )
+                for (_, future), prediction in zip(batch, predictions):
+                    if not future.done():
+                        future.set_result(int(prediction))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+batcher = MicroBatcher(MAX_BATCH_SIZE, MAX_WAIT_MS, MAX_QUEUE_SIZE)
+
+
 @router.post("/", response_model=ChurnPrediction)
 async def predict_churn(data: ChurnInput, background_tasks: BackgroundTasks):
     """
     Predict customer churn probability for a single customer
     """
     try:
-        input_data = data.model_dump()
+        values = _row_values(data)
+        input_data = dict(zip(_SCHEMA_COLS, values))
         logger.info(f"Received input data: {input_data}")
         
-        # Validate
-        is_valid, error_msg = validate_input(input_data)
-        if not is_valid:
+        # Validate - the model handles preprocessing internally
+        _, valid = _prepare_df([values])
+        if not valid[0]:
+            error_msg = _validation_error(values)
             logger.error(f"Validation failed: {error_msg}")
             raise HTTPException(status_code=422, detail=error_msg)
         
-        # Map schema to model input format (model has built-in preprocessing)
-        mapped_data = map_schema_to_preprocessing(input_data)
-        
-        # Convert to DataFrame - model will handle preprocessing internally
-        df_input = pd.DataFrame([mapped_data])
-        
-        # Convert numeric columns to float as required by model schema
-        float_columns = ['usage_frequency', 'payment_delay_days', 'total_spend']
-        for col in float_columns:
-            if col in df_input.columns:
-                df_input[col] = df_input[col].astype(float)
-        
-        logger.info(f"Input DataFrame shape: {df_input.shape}, columns: {df_input.columns.tolist()}")
-        logger.info(f"DataFrame dtypes: {df_input.dtypes.to_dict()}")
-        
         # Predict - model has built-in preprocessing
-        model = get_model()
-        prediction = model.predict(df_input)[0]
-        prediction_int = int(prediction)
+        key = tuple(values)
+        prediction_int = _cached_predictions([key])[0]
+        if prediction_int is None:
+            try:
+                prediction_int = await batcher.predict(values)
+            except asyncio.QueueFull:
+                raise HTTPException(status_code=429, detail="Too many pending predictions, retry later")
+            _store_predictions([key], [prediction_int])
         
         logger.info(f"Single prediction: {prediction_int}")
         
@@ -111,57 +286,43 @@ async def predict_batch(data_list: List[ChurnInput], background_tasks: Backgroun
         
         logger.info(f"Processing batch of {len(data_list)} customers")
         
-        results = []
-        all_inputs = []
+        # Neutral prediction for invalid rows; valid rows are filled in below
+        results = [ChurnPrediction(churn=0) for _ in data_list]
+        
+        # Map and validate all customers in one pass
+        rows = [_row_values(data) for data in data_list]
+        df_all, valid = _prepare_df(rows)
+        for idx in np.flatnonzero(~valid):
+            logger.warning(f"Validation failed for customer {idx}: {_validation_error(rows[idx])}")
+        valid_idx = np.flatnonzero(valid)
         
-        # Process all customers
-        for idx, data in enumerate(data_list):
+        # Serve cached rows, then predict the rest with a single model call
+        all_inputs = []
+        if len(valid_idx):
             try:
-                input_data = data.model_dump()
-                
-                # Validate
-                is_valid, error_msg = validate_input(input_data)
-                if not is_valid:
-                    logger.warning(f"Validation failed for customer {idx}: {error_msg}")
-                    # Return neutral prediction for invalid data
-                    results.append(ChurnPrediction(
-                        churn=0
-                    ))
-                    continue
-                
-                # Map schema to model input format (model has built-in preprocessing)
-                mapped_data = map_schema_to_preprocessing(input_data)
-                
-                # Convert to DataFrame - model will handle preprocessing internally
-                df_input = pd.DataFrame([mapped_data])
-                
-                # Convert numeric columns to float as required by model schema
-                float_columns = ['usage_frequency', 'payment_delay_days', 'total_spend']
-                for col in float_columns:
-                    if col in df_input.columns:
-                        df_input[col] = df_input[col].astype(float)
-                
-                # Predict - model has built-in preprocessing
-                model = get_model()
-                prediction = model.predict(df_input)[0]
-                prediction_int = int(prediction)
-                
-                results.append(ChurnPrediction(
-                    churn=prediction_int
-                ))
-                
-                all_inputs.append((input_data, prediction_int))
-                
+                keys = [tuple(rows[idx]) for idx in valid_idx]
+                predictions = _cached_predictions(keys)
+                miss = [i for i, pred in enumerate(predictions) if pred is None]
+                if miss:
+                    miss_idx = valid_idx[miss]
+                    df_input = df_all if len(miss_idx) == len(df_all) else df_all.iloc[miss_idx]
+                    miss_preds = [int(pred) for pred in get_model().predict(df_input)]
+                    for i, prediction in zip(miss, miss_preds):
+                        predictions[i] = prediction
+                    _store_predictions([keys[i] for i in miss], miss_preds)
+                for idx, prediction_int in zip(valid_idx, predictions):
+                    results[idx] = ChurnPrediction(churn=prediction_int)
+                    all_inputs.append((dict(zip(_SCHEMA_COLS, rows[idx])), prediction_int))
             except Exception as e:
-                logger.error(f"Error processing customer {idx}: {str(e)}")
-                # Return neutral prediction on error
-                results.append(ChurnPrediction(
-                    churn=0
-                ))
-        
-        # Save all to production data (background) - without probability
-        for input_data, pred in all_inputs:
-            background_tasks.add_task(save_production_data, input_data, pred)
+                logger.error(f"Error predicting batch of {len(valid_idx)} customers: {str(e)}")
+        
+        # Save all to production data in one write (background) - without probability
+        if all_inputs:
+            background_tasks.add_task(
+                save_production_data_batch,
+                [input_data for input_data, _ in all_inputs],
+                [pred for _, pred in all_inputs],
+            )
         
         logger.info(f"Batch prediction completed: {len(results)} results")
         
@@ -1,5 +1,9 @@
 import mlflow
 import os
+from typing import Any
+
+# Loaded pyfunc models by URI, so each model is downloaded and deserialized once per process
+_MODEL_CACHE: dict[str, Any] = {}
 
 
 def load_model(model_uri: str = "runs:/c4b92406479d490993622563a35a47f7/xgboost_churn"):
@@ -12,6 +16,9 @@ def load_model(model_uri: str = "runs:/c4b92406479d490993622563a35a47f7/xgboost_
     Returns:
         Loaded MLflow model
     """
+    if model_uri in _MODEL_CACHE:
+        return _MODEL_CACHE[model_uri]
+
     MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI")
 
     # 1. Configure MLflow Tracking
@@ -22,6 +29,7 @@ def load_model(model_uri: str = "runs:/c4b92406479d490993622563a35a47f7/xgboost_
     
     # 3. Load model
     model = mlflow.pyfunc.load_model(model_uri)
+    _MODEL_CACHE[model_uri] = model
     
     print("Model loaded successfully!")
     
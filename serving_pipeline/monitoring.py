@@ -1,120 +1,130 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import os
 import logging
-import json
 
 logger = logging.getLogger(__name__)
 
+# Drift features (API schema names), split by type once instead of per report
+NUMERICAL_DRIFT_FEATURES = [
+    'Age', 'Tenure', 'Usage_Frequency', 'Support_Calls',
+    'Payment_Delay', 'Total_Spend', 'Last_Interaction'
+]
+CATEGORICAL_DRIFT_FEATURES = ['Gender', 'Subscription_Type', 'Contract_Length']
+DRIFT_FEATURES = [
+    'Age', 'Gender', 'Tenure', 'Usage_Frequency', 'Support_Calls',
+    'Payment_Delay', 'Subscription_Type', 'Contract_Length',
+    'Total_Spend', 'Last_Interaction'
+]
+_FEATURE_TYPES = {
+    **{col: 'num' for col in NUMERICAL_DRIFT_FEATURES},
+    **{col: 'cat' for col in CATEGORICAL_DRIFT_FEATURES},
+}
 
-def generate_drift_report(
-    current_df: pd.DataFrame, 
-    reference_df: pd.DataFrame, 
-    output_path: Optional[str] = None,
-    include_classification: bool = False
-) -> Dict[str, Any]:
+
+# Drift tests converge well before this many rows per side
+MAX_DRIFT_SAMPLES = 10_000
+
+
+def downsample_for_drift(df: pd.DataFrame, max_samples: Optional[int], name: str) -> pd.DataFrame:
     """
-    Generate drift report and return metrics as JSON.
-    
-    Args:
-        current_df: Current production data
-        reference_df: Reference/baseline data
-        output_path: Optional path to save HTML report
-        include_classification: Whether to include classification metrics (requires target/prediction columns)
-        
-    Returns:
-        Dictionary with drift metrics
+    Sample at most max_samples rows, stratified on prediction when present
     """
-    # Lazy import 
-    try:
-        from evidently.report import Report
-        from evidently.metric_preset import DataDriftPreset, ClassificationPreset
-        from evidently import ColumnMapping
-    except ImportError as e:
-        logger.error(f"Failed to import Evidently AI: {e}")
-        raise ImportError(
-            "Evidently AI is not installed or incompatible. "
-            "Please install: pip install evidently"
-        ) from e
+    if not max_samples or len(df) <= max_samples:
+        return df
     
-    logger.info(f"Generating drift report - Reference: {reference_df.shape}, Current: {current_df.shape}")
-    logger.info(f"Include classification: {include_classification}")
-    
-    # Build metrics list - always include data drift
-    metrics_list = [DataDriftPreset()]
-    
-    # Only include classification if requested and columns exist
-    if include_classification:
-        has_target = 'target' in reference_df.columns and 'target' in current_df.columns
-        has_prediction = 'prediction' in reference_df.columns and 'prediction' in current_df.columns
-        
-        if has_target and has_prediction:
-            metrics_list.append(ClassificationPreset())
-            logger.info("Classification metrics added")
-        else:
-            logger.warning(f"Classification metrics requested but columns not found. "
-                         f"Has target: {has_target}, Has prediction: {has_prediction}")
+    if 'prediction' in df.columns:
+        sampled = df.groupby('prediction', group_keys=False).sample(
+            frac=max_samples / len(df), random_state=0
+        )
+    else:
+        sampled = df.sample(max_samples, random_state=0)
+    logger.info(f"Downsampled {name} data for drift report: {len(df)} -> {len(sampled)} rows")
+    return sampled
+
+
+@lru_cache(maxsize=16)
+def _column_mapping(columns: tuple, numeric_columns: frozenset):
+    """
+    Evidently ColumnMapping for a column layout, built once per layout
     
-    # Define column mapping for better drift detection
-    numerical_features = []
-    categorical_features = []
+    Known drift features use their fixed type; any other column falls back
+    to its dtype (numeric_columns).
+    """
+    from evidently import ColumnMapping
     
-    for col in reference_df.columns:
-        if col in ['target', 'prediction', 'timestamp']:
-            continue
-        if reference_df[col].dtype in ['int64', 'float64']:
-            numerical_features.append(col)
-        else:
-            categorical_features.append(col)
+    features = [col for col in columns if col not in ('target', 'prediction', 'timestamp')]
+    numerical_features = [
+        col for col in features
+        if _FEATURE_TYPES.get(col, 'num' if col in numeric_columns else 'cat') == 'num'
+    ]
+    categorical_features = [col for col in features if col not in numerical_features]
+    logger.info(f"Column mapping - Numerical: {numerical_features}, Categorical: {categorical_features}")
     
-    column_mapping = ColumnMapping(
-        target='target' if 'target' in reference_df.columns else None,
-        prediction='prediction' if 'prediction' in reference_df.columns else None,
+    return ColumnMapping(
+        target='target' if 'target' in columns else None,
+        prediction='prediction' if 'prediction' in columns else None,
         numerical_features=numerical_features if numerical_features else None,
         categorical_features=categorical_features if categorical_features else None
     )
-    
-    logger.info(f"Column mapping - Numerical: {numerical_features}, Categorical: {categorical_features}")
-    
-    # Create report
-    report = Report(metrics=metrics_list)
-    
-    try:
-        report.run(
-            reference_data=reference_df, 
-            current_data=current_df,
-            column_mapping=column_mapping
-        )
-        logger.info("Report execution completed")
-    except Exception as e:
-        logger.error(f"Error running report: {e}", exc_info=True)
-        raise
-    
-    # Save HTML report if path provided
-    if output_path:
-        try:
-            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
-            report.save_html(output_path)
-            logger.info(f"HTML report saved to: {output_path}")
-        except Exception as e:
-            logger.error(f"Error saving HTML report: {e}", exc_info=True)
-    
-    # Extract metrics as dictionary
+
+
+# (result key, metrics key, warn when missing) read from as_dict() results
+_DRIFT_FIELDS = (
+    ('dataset_drift', 'dataset_drift', True),
+    ('drift_share', 'drift_share', False),
+    ('number_of_drifted_columns', 'number_of_drifted_features', True),
+    ('number_of_columns', 'total_features', True),
+)
+_CLASSIFICATION_FIELDS = (
+    ('target_drift', 'target_drift', False),
+    ('prediction_drift', 'prediction_drift', False),
+)
+_MISSING = object()
+
+
+def _copy_fields(result: Dict[str, Any], fields: tuple, metrics_dict: Dict[str, Any]):
+    """Copy the present result fields into metrics_dict with one lookup each"""
+    for src, dst, required in fields:
+        value = result.get(src, _MISSING)
+        if value is not _MISSING:
+            metrics_dict[dst] = value
+            logger.info(f"   {src}: {value}")
+        elif required:
+            logger.warning(f"   '{src}' not found in result")
+
+
+def _set_drift_by_feature(metrics_dict: Dict[str, Any], drift_by_feature: dict, drifted: int):
+    """Store per-feature drift and the share of drifted features (0-1, higher = more drift)"""
+    metrics_dict['drift_by_feature'] = drift_by_feature
+    total = len(drift_by_feature)
+    if total:
+        metrics_dict['overall_drift_score'] = drifted / total
+        logger.info(f"Calculated drift score: {drifted / total} ({drifted}/{total})")
+    logger.info(f"   drift_by_columns: {total} features")
+
+
+def _metrics_from_dict(report) -> Dict[str, Any]:
+    """Extract drift metrics from the full report.as_dict() serialization"""
     metrics_dict = {}
     
     # Get report results
     try:
         report_dict = report.as_dict()
         
-        # DEBUG: Log full structure (only first time or if debug enabled)
-        if logger.level <= logging.DEBUG:
-            logger.debug("="*50)
-            logger.debug("FULL REPORT STRUCTURE:")
-            logger.debug(json.dumps(report_dict, indent=2, default=str)[:2000])  # Limit to 2000 chars
-            logger.debug("="*50)
-        
-        # Log top-level keys
+        # Log top-level keys only; serializing the full report costs O(report)
         logger.info(f"Report dict keys: {list(report_dict.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Report metric types: %s",
+                [str(metric.get('metric', '')) for metric in report_dict.get('metrics', [])]
+            )
         
         # Extract data drift metrics
         if 'metrics' in report_dict:
@@ -138,64 +148,37 @@ def generate_drift_report(
                 if 'DataDrift' in metric_type or 'data_drift' in metric_type.lower():
                     logger.info("  Processing DataDrift metric")
                     
-                    # Overall dataset drift
-                    if 'dataset_drift' in result:
-                        metrics_dict['dataset_drift'] = result['dataset_drift']
-                        logger.info(f"   dataset_drift: {result['dataset_drift']}")
-                    else:
-                        logger.warning("   'dataset_drift' not found in result")
-                    
-                    # Drift share (alternative to dataset_drift in some versions)
-                    if 'drift_share' in result:
-                        metrics_dict['drift_share'] = result['drift_share']
-                        logger.info(f"   drift_share: {result['drift_share']}")
+                    # Dataset drift, drift share and drifted/total column counts
+                    _copy_fields(result, _DRIFT_FIELDS, metrics_dict)
                     
-                    # Drift by feature
-                    if 'drift_by_columns' in result:
+                    # Drift by feature (drifted count accumulated in the same pass)
+                    columns_result = result.get('drift_by_columns')
+                    if columns_result is not None:
                         drift_by_columns = {}
-                        for col_name, col_result in result['drift_by_columns'].items():
+                        drifted = 0
+                        for col_name, col_result in columns_result.items():
+                            detected = col_result.get('drift_detected', False)
+                            drifted += bool(detected)
                             drift_by_columns[col_name] = {
                                 'drift_score': col_result.get('drift_score', 0),
-                                'drift_detected': col_result.get('drift_detected', False),
+                                'drift_detected': detected,
                                 'statistical_test': col_result.get('stattest_name', col_result.get('stattest', 'unknown'))
                             }
-                        metrics_dict['drift_by_feature'] = drift_by_columns
-                        logger.info(f"   drift_by_columns: {len(drift_by_columns)} features")
+                        _set_drift_by_feature(metrics_dict, drift_by_columns, drifted)
                     else:
                         logger.warning("   'drift_by_columns' not found in result")
-                    
-                    # Number of drifted features
-                    if 'number_of_drifted_columns' in result:
-                        metrics_dict['number_of_drifted_features'] = result['number_of_drifted_columns']
-                        logger.info(f"   number_of_drifted_columns: {result['number_of_drifted_columns']}")
-                    else:
-                        logger.warning("   'number_of_drifted_columns' not found")
-                    
-                    if 'number_of_columns' in result:
-                        metrics_dict['total_features'] = result['number_of_columns']
-                        logger.info(f"   number_of_columns: {result['number_of_columns']}")
-                    else:
-                        logger.warning("   'number_of_columns' not found")
                 
                 # ===== CLASSIFICATION METRICS =====
                 elif 'Classification' in metric_type or 'classification' in metric_type.lower():
                     logger.info("  Processing Classification metric")
                     
-                    # Target drift
-                    if 'target_drift' in result:
-                        metrics_dict['target_drift'] = result['target_drift']
-                        logger.info(f"   target_drift: {result['target_drift']}")
-                    
-                    # Prediction drift
-                    if 'prediction_drift' in result:
-                        metrics_dict['prediction_drift'] = result['prediction_drift']
-                        logger.info(f"  prediction_drift: {result['prediction_drift']}")
+                    # Target and prediction drift
+                    _copy_fields(result, _CLASSIFICATION_FIELDS, metrics_dict)
                     
                     # Performance metrics
-                    if 'reference' in result and 'current' in result:
-                        ref_metrics = result.get('reference', {})
-                        curr_metrics = result.get('current', {})
-                        
+                    ref_metrics = result.get('reference')
+                    curr_metrics = result.get('current')
+                    if ref_metrics is not None and curr_metrics is not None:
                         metrics_dict['performance'] = {
                             'reference': {
                                 'accuracy': ref_metrics.get('accuracy', 0),
@@ -219,21 +202,159 @@ def generate_drift_report(
         logger.error(f"Error parsing metrics: {e}", exc_info=True)
         metrics_dict['error'] = str(e)
     
-    # Calculate overall drift score (0-1, higher = more drift)
-    drift_score = 0.0
-    if 'drift_by_feature' in metrics_dict and metrics_dict['drift_by_feature']:
-        drifted_features = sum(
-            1 for f in metrics_dict['drift_by_feature'].values() 
-            if f.get('drift_detected', False)
+    return metrics_dict
+
+
+def _metrics_from_results(report) -> Dict[str, Any]:
+    """
+    Extract drift metrics straight from the typed metric results
+    
+    Avoids report.as_dict(), which serializes the whole report (including
+    plot data) only for a handful of fields to be read back.
+    """
+    metrics_dict = {}
+    
+    first_level_metrics = report._first_level_metrics
+    if not first_level_metrics:
+        raise AttributeError("report has no first-level metrics")
+    
+    for metric in first_level_metrics:
+        metric_type = type(metric).__name__
+        result = metric.get_result()
+        
+        # ===== DATA DRIFT METRICS =====
+        if 'DataDrift' in metric_type:
+            metrics_dict['dataset_drift'] = bool(result.dataset_drift)
+            drift_by_columns = {}
+            drifted = 0
+            for col_name, col_result in result.drift_by_columns.items():
+                detected = bool(col_result.drift_detected)
+                drifted += detected
+                drift_by_columns[col_name] = {
+                    'drift_score': float(col_result.drift_score),
+                    'drift_detected': detected,
+                    'statistical_test': col_result.stattest_name
+                }
+            _set_drift_by_feature(metrics_dict, drift_by_columns, drifted)
+            metrics_dict['number_of_drifted_features'] = int(result.number_of_drifted_columns)
+            metrics_dict['total_features'] = int(result.number_of_columns)
+        
+        # ===== CLASSIFICATION METRICS =====
+        elif 'Classification' in metric_type:
+            current = getattr(result, 'current', None)
+            reference = getattr(result, 'reference', None)
+            if hasattr(current, 'accuracy') and hasattr(reference, 'accuracy'):
+                metrics_dict['performance'] = {
+                    name: {
+                        'accuracy': float(quality.accuracy),
+                        'precision': float(quality.precision),
+                        'recall': float(quality.recall),
+                        'f1': float(quality.f1)
+                    }
+                    for name, quality in (('reference', reference), ('current', current))
+                }
+                logger.info("   performance metrics extracted")
+    
+    return metrics_dict
+
+
+def generate_drift_report(
+    current_df: pd.DataFrame, 
+    reference_df: pd.DataFrame, 
+    output_path: Optional[str] = None,
+    include_classification: bool = False,
+    max_samples: Optional[int] = MAX_DRIFT_SAMPLES
+) -> Dict[str, Any]:
+    """
+    Generate drift report and return metrics as JSON.
+    
+    Args:
+        current_df: Current production data
+        reference_df: Reference/baseline data
+        output_path: Optional path to save HTML report
+        include_classification: Whether to include classification metrics (requires target/prediction columns)
+        max_samples: Row cap per dataset before running the report (None = use all rows)
+        
+    Returns:
+        Dictionary with drift metrics
+    """
+    # Lazy import 
+    try:
+        from evidently.report import Report
+        from evidently.metric_preset import DataDriftPreset, ClassificationPreset
+    except ImportError as e:
+        logger.error(f"Failed to import Evidently AI: {e}")
+        raise ImportError(
+            "Evidently AI is not installed or incompatible. "
+            "Please install: pip install evidently"
+        ) from e
+    
+    logger.info(f"Generating drift report - Reference: {reference_df.shape}, Current: {current_df.shape}")
+    reference_df = downsample_for_drift(reference_df, max_samples, "reference")
+    current_df = downsample_for_drift(current_df, max_samples, "current")
+    logger.info(f"Include classification: {include_classification}")
+    
+    # Build metrics list - always include data drift
+    metrics_list = [DataDriftPreset()]
+    
+    # Only include classification if requested and columns exist
+    if include_classification:
+        common_columns = set(reference_df.columns).intersection(current_df.columns)
+        has_target = 'target' in common_columns
+        has_prediction = 'prediction' in common_columns
+        
+        if has_target and has_prediction:
+            metrics_list.append(ClassificationPreset())
+            logger.info("Classification metrics added")
+        else:
+            logger.warning(f"Classification metrics requested but columns not found. "
+                         f"Has target: {has_target}, Has prediction: {has_prediction}")
+    
+    # Define column mapping for better drift detection (cached per column layout)
+    unknown_columns = [col for col in reference_df.columns if col not in _FEATURE_TYPES]
+    column_mapping = _column_mapping(
+        tuple(reference_df.columns),
+        frozenset(
+            col for col in unknown_columns
+            if reference_df[col].dtype in ['int64', 'float64']
         )
-        total_features = len(metrics_dict['drift_by_feature'])
-        if total_features > 0:
-            drift_score = drifted_features / total_features
-            logger.info(f"Calculated drift score: {drift_score} ({drifted_features}/{total_features})")
-    else:
+    )
+    
+    # Create report
+    report = Report(metrics=metrics_list)
+    
+    try:
+        report.run(
+            reference_data=reference_df, 
+            current_data=current_df,
+            column_mapping=column_mapping
+        )
+        logger.info("Report execution completed")
+    except Exception as e:
+        logger.error(f"Error running report: {e}", exc_info=True)
+        raise
+    
+    # Save HTML report if path provided
+    if output_path:
+        try:
+            os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else '.', exist_ok=True)
+            report.save_html(output_path)
+            logger.info(f"HTML report saved to: {output_path}")
+        except Exception as e:
+            logger.error(f"Error saving HTML report: {e}", exc_info=True)
+    
+    # Extract metrics as dictionary
+    try:
+        metrics_dict = _metrics_from_results(report)
+    except (AttributeError, TypeError) as e:
+        logger.warning(f"Typed metric results unavailable ({e}); falling back to as_dict()")
+        metrics_dict = _metrics_from_dict(report)
+    
+    # Overall drift score is computed while the per-feature results are parsed
+    drift_score = metrics_dict.setdefault('overall_drift_score', 0.0)
+    if not metrics_dict.get('drift_by_feature'):
         logger.warning("No drift_by_feature data available to calculate drift score")
     
-    metrics_dict['overall_drift_score'] = drift_score
     metrics_dict['drift_status'] = 'HIGH' if drift_score > 0.5 else 'MEDIUM' if drift_score > 0.2 else 'LOW'
     
     logger.info(f"Final drift status: {metrics_dict['drift_status']} (score: {drift_score})")
@@ -241,12 +362,82 @@ def generate_drift_report(
     return metrics_dict
 
 
-def load_reference_data(file_path: str = "data_model/reference/reference_data.csv") -> pd.DataFrame:
+# Formats Arrow tries for timestamp columns while parsing CSVs
+TIMESTAMP_PARSERS = [pacsv.ISO8601, '%Y-%m-%d %H:%M:%S']
+
+
+@lru_cache(maxsize=8)
+def _read_csv_table(
+    file_path: str,
+    mtime_ns: int,
+    size: int,
+    columns: Optional[tuple] = None
+) -> pa.Table:
+    """
+    Parse a CSV with Arrow, keeping only the requested columns that exist.
+    
+    mtime_ns and size are part of the cache key only, so a rewritten file is
+    parsed again while repeated drift checks reuse the parsed table.
+    """
+    read_options = pacsv.ReadOptions(use_threads=True)
+    # Timestamps are parsed inline by Arrow, no pd.to_datetime pass afterwards
+    convert_options = pacsv.ConvertOptions(timestamp_parsers=TIMESTAMP_PARSERS)
+    if columns is not None:
+        available = pacsv.open_csv(file_path, read_options=read_options).schema.names
+        convert_options.include_columns = [col for col in columns if col in available]
+    return pacsv.read_csv(
+        file_path, read_options=read_options, convert_options=convert_options
+    )
+
+
+def read_csv_table(file_path: str, columns: Optional[list] = None) -> pa.Table:
+    """Cached Arrow CSV read, invalidated when the file changes on disk"""
+    stat = os.stat(file_path)
+    return _read_csv_table(
+        file_path,
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(columns) if columns is not None else None
+    )
+
+
+@lru_cache(maxsize=4)
+def _load_reference_frame(
+    file_path: str,
+    mtime_ns: int,
+    size: int,
+    columns: Optional[tuple] = None
+) -> pd.DataFrame:
+    """
+    Reference DataFrame memoized per file version and column selection.
+    
+    The reference set does not change while the service runs, so repeated
+    drift checks skip both the CSV parse and the Arrow -> pandas conversion.
+    """
+    df = _read_csv_table(file_path, mtime_ns, size, columns).to_pandas()
+    logger.info(f"Loaded reference data: {df.shape}")
+    
+    # Arrow leaves timestamps it could not parse as strings
+    if 'timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        logger.info("Converted timestamp column to datetime")
+    
+    return df
+
+
+def load_reference_data(
+    file_path: str = "data_model/reference/reference_data.csv",
+    columns: Optional[list] = None
+) -> pd.DataFrame:
     """
     Load reference/baseline data for drift monitoring.
     
+    The result is cached until the file changes on disk; treat it as
+    read-only and copy before modifying.
+    
     Args:
         file_path: Path to reference data CSV
+        columns: Columns to load (default: all); missing ones are skipped
         
     Returns:
         DataFrame with reference data
@@ -257,27 +448,102 @@ def load_reference_data(file_path: str = "data_model/reference/reference_data.cs
         logger.error(f"Reference data file not found: {file_path}")
         raise FileNotFoundError(f"Reference data not found: {file_path}")
     
-    df = pd.read_csv(file_path)
-    logger.info(f"Loaded reference data: {df.shape}")
+    stat = os.stat(file_path)
+    return _load_reference_frame(
+        file_path,
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(columns) if columns is not None else None
+    )
+
+
+def _load_current_parquet(
+    file_path: str,
+    days: int,
+    columns: Optional[list] = None
+) -> pd.DataFrame:
+    """Read a Parquet production dataset, pushing the days filter into the scan"""
+    dataset = ds.dataset(file_path, format='parquet')
+    names = dataset.schema.names
+    if columns is not None:
+        columns = [col for col in columns if col in names]
     
-    # Convert timestamp to datetime if exists
-    if 'timestamp' in df.columns:
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        logger.info("Converted timestamp column to datetime")
+    row_filter = None
+    if 'timestamp' in names:
+        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff = pa.scalar(cutoff_date, type=dataset.schema.field('timestamp').type)
+        row_filter = ds.field('timestamp') >= cutoff
+        logger.info(f"Filtering to data after {cutoff_date}")
+    
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    logger.info(f"Loaded production data: {table.shape}")
+    return table.to_pandas()
+
+
+def _load_current_csv(
+    file_path: str,
+    days: int,
+    columns: Optional[list] = None
+) -> pd.DataFrame:
+    """Read a production CSV, filtering by days on the Arrow table"""
+    if columns is not None and 'timestamp' not in columns:
+        columns = list(columns) + ['timestamp']
+    table = read_csv_table(file_path, columns)
+    logger.info(f"Loaded production data: {table.shape}")
     
+    # Filter by recent days on the Arrow table so only kept rows are converted
+    if 'timestamp' not in table.column_names:
+        return table.to_pandas()
+    
+    cutoff_date = datetime.now() - timedelta(days=days)
+    timestamp_type = table.schema.field('timestamp').type
+    if pa.types.is_timestamp(timestamp_type):
+        # Parsed by Arrow: filter with a compute kernel, no pandas round-trip
+        before_shape = table.shape
+        cutoff = pa.scalar(cutoff_date, type=timestamp_type)
+        table = table.filter(pc.greater_equal(table.column('timestamp'), cutoff))
+        logger.info(
+            f"Filtered to data after {cutoff_date}: "
+            f"{before_shape} -> {table.shape}"
+        )
+        return table.to_pandas()
+    
+    # Mixed or malformed values stay strings; convert, coercing errors to NaT
+    timestamps = pd.to_datetime(table.column('timestamp').to_pandas(), errors='coerce')
+    
+    # Only apply time filtering if we actually have valid timestamps
+    if timestamps.notna().any():
+        before_shape = table.shape
+        mask = (timestamps >= cutoff_date).to_numpy()
+        table = table.filter(pa.array(mask))
+        timestamps = timestamps[mask]
+        logger.info(
+            f"Filtered to data after {cutoff_date}: "
+            f"{before_shape} -> {table.shape}"
+        )
+    else:
+        logger.info(
+            "Timestamp column exists but has no valid values; "
+            "skipping time-based filtering and using all rows."
+        )
+    df = table.to_pandas()
+    df['timestamp'] = timestamps.to_numpy()
     return df
 
 
 def load_current_data(
-    file_path: str = "data_model/production/production.csv",
-    days: int = 30
+    file_path: str = "data_model/production/production_log",
+    days: int = 30,
+    columns: Optional[list] = None
 ) -> pd.DataFrame:
     """
     Load current production data for drift monitoring.
     
     Args:
-        file_path: Path to production data CSV
+        file_path: Path to the production Parquet dataset (directory or
+            .parquet file) or production data CSV
         days: Number of recent days to include (default: 30)
+        columns: Columns to load (default: all); missing ones are skipped
         
     Returns:
         DataFrame with recent production data
@@ -288,29 +554,10 @@ def load_current_data(
         logger.error(f"Production data file not found: {file_path}")
         raise FileNotFoundError(f"Production data not found: {file_path}")
     
-    df = pd.read_csv(file_path)
-    logger.info(f"Loaded production data: {df.shape}")
-    
-    # Convert timestamp to datetime and optionally filter by recent days
-    if 'timestamp' in df.columns:
-        # Convert, coerce errors to NaT for safety
-        df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
-        
-        # Only apply time filtering if we actually have valid timestamps
-        if df['timestamp'].notna().any():
-            from datetime import datetime, timedelta
-            cutoff_date = datetime.now() - timedelta(days=days)
-            before_shape = df.shape
-            df = df[df['timestamp'] >= cutoff_date]
-            logger.info(
-                f"Filtered to data after {cutoff_date}: "
-                f"{before_shape} -> {df.shape}"
-            )
-        else:
-            logger.info(
-                "Timestamp column exists but has no valid values; "
-                "skipping time-based filtering and using all rows."
-            )
+    if os.path.isdir(file_path) or file_path.endswith(('.parquet', '.pq')):
+        df = _load_current_parquet(file_path, days, columns)
+    else:
+        df = _load_current_csv(file_path, days, columns)
     
     if len(df) == 0:
         logger.error(
@@ -319,4 +566,4 @@ def load_current_data(
         )
         raise ValueError("No production data available for drift analysis")
     
-    return df
\ No newline at end of file
+    return df
@@ -1,6 +1,20 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+import pyarrow as pa
+import pyarrow.parquet as pq
+import csv
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Guards appends to the production data file
+_production_file_lock = threading.Lock()
 
 # Mapping dictionaries
 GENDER_MAPPING = {'Male': 1, 'Female': 0}
@@ -22,6 +36,50 @@ ENGINEERED_FEATURES = [
     'avg_monthly_spend'
 ]
 
+# Schema field name -> preprocessing (model input) column name
+SCHEMA_TO_PREPROCESSING = {
+    'Age': 'age',
+    'Tenure': 'tenure_months',
+    'Usage_Frequency': 'usage_frequency',
+    'Support_Calls': 'support_calls',
+    'Payment_Delay': 'payment_delay_days',
+    'Total_Spend': 'total_spend',
+    'Last_Interaction': 'last_interaction_days',
+    'Gender': 'gender',
+    'Subscription_Type': 'subscription_type',
+    'Contract_Length': 'contract_length'
+}
+
+# Any accepted key spelling -> preprocessing column name: schema names,
+# their lowercase forms and the preprocessing names themselves
+_CANONICAL_KEYS = {
+    **{preprocess_key: preprocess_key for preprocess_key in SCHEMA_TO_PREPROCESSING.values()},
+    **{schema_key.lower(): preprocess_key for schema_key, preprocess_key in SCHEMA_TO_PREPROCESSING.items()},
+}
+
+# Numeric columns the model signature expects as float
+FLOAT_COLUMNS = ['usage_frequency', 'payment_delay_days', 'total_spend']
+
+# Allowed (min, max) per numeric field and values per categorical field
+VALIDATION_RANGES = [
+    ('age', 18, 100),
+    ('tenure_months', 0, 72),
+    ('usage_frequency', 0, 30),
+    ('support_calls', 0, 20),
+    ('payment_delay_days', 0, 60),
+    ('total_spend', 0, 10000),
+    ('last_interaction_days', 0, 365)
+]
+
+CATEGORY_VALUES = {
+    'gender': frozenset({'Male', 'Female', 'male', 'female'}),
+    'subscription_type': frozenset({'Basic', 'Standard', 'Premium', 'basic', 'standard', 'premium'}),
+    'contract_length': frozenset({'Monthly', 'Quarterly', 'Annual', 'monthly', 'quarterly', 'annual'}),
+}
+
+# Required fields (using preprocessing column names)
+REQUIRED_FIELDS = tuple(SCHEMA_TO_PREPROCESSING.values())
+
 
 def map_schema_to_preprocessing(data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -33,32 +91,20 @@ def map_schema_to_preprocessing(data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary with preprocessing field names (age, tenure_months, etc.)
     """
-    mapping = {
-        'Age': 'age',
-        'Tenure': 'tenure_months',
-        'Usage_Frequency': 'usage_frequency',
-        'Support_Calls': 'support_calls',
-        'Payment_Delay': 'payment_delay_days',
-        'Total_Spend': 'total_spend',
-        'Last_Interaction': 'last_interaction_days',
-        'Gender': 'gender',
-        'Subscription_Type': 'subscription_type',
-        'Contract_Length': 'contract_length'
-    }
-    
-    # Convert to lowercase keys for case-insensitive matching
-    data_lower = {k.lower(): v for k, v in data.items()}
     mapped_data = {}
     
-    for schema_key, preprocess_key in mapping.items():
-        # Try exact match first, then case-insensitive
-        if schema_key in data:
-            mapped_data[preprocess_key] = data[schema_key]
-        elif schema_key.lower() in data_lower:
-            mapped_data[preprocess_key] = data_lower[schema_key.lower()]
-        elif preprocess_key in data:
-            # Already in correct format
-            mapped_data[preprocess_key] = data[preprocess_key]
+    # Single pass over the input keys
+    for key, value in data.items():
+        if key in SCHEMA_TO_PREPROCESSING:
+            # Exact schema match wins over any other spelling
+            mapped_data[SCHEMA_TO_PREPROCESSING[key]] = value
+            continue
+        preprocess_key = _CANONICAL_KEYS.get(key)
+        if preprocess_key is None:
+            # Case-insensitive schema match
+            preprocess_key = _CANONICAL_KEYS.get(key.lower())
+        if preprocess_key is not None:
+            mapped_data.setdefault(preprocess_key, value)
     
     return mapped_data
 
@@ -134,34 +180,18 @@ def validate_input(data: Dict[str, Any]) -> tuple[bool, str]:
     Returns:
         (is_valid, error_message)
     """
-    # Map schema to preprocessing format for validation
-    if any(key[0].isupper() for key in data.keys()):  # Schema format detected
+    # Map schema to preprocessing format for validation; schema keys are
+    # capitalized, so the first key is enough to detect the format
+    if data and next(iter(data))[0].isupper():  # Schema format detected
         data = map_schema_to_preprocessing(data)
     
-    # Required fields (using preprocessing column names)
-    required_fields = [
-        'age', 'gender', 'tenure_months', 'usage_frequency',
-        'support_calls', 'payment_delay_days', 'subscription_type',
-        'contract_length', 'total_spend', 'last_interaction_days'
-    ]
-    
     # Check missing fields
-    missing_fields = [f for f in required_fields if f not in data]
+    missing_fields = [f for f in REQUIRED_FIELDS if f not in data]
     if missing_fields:
         return False, f"Missing required fields: {', '.join(missing_fields)}"
     
     # Validate ranges
-    validations = [
-        ('age', 18, 100),
-        ('tenure_months', 0, 72),
-        ('usage_frequency', 0, 30),
-        ('support_calls', 0, 20),
-        ('payment_delay_days', 0, 60),
-        ('total_spend', 0, 10000),
-        ('last_interaction_days', 0, 365)
-    ]
-    
-    for field, min_val, max_val in validations:
+    for field, min_val, max_val in VALIDATION_RANGES:
         value = data.get(field)
         if value is None:
             continue
@@ -172,20 +202,39 @@ def validate_input(data: Dict[str, Any]) -> tuple[bool, str]:
     
     # Validate categorical fields
     gender = data.get('gender')
-    if gender not in ['Male', 'Female', 'male', 'female']:
+    if gender not in CATEGORY_VALUES['gender']:
         return False, "gender must be 'Male' or 'Female'"
     
     subscription_type = data.get('subscription_type')
-    if subscription_type not in ['Basic', 'Standard', 'Premium', 'basic', 'standard', 'premium']:
+    if subscription_type not in CATEGORY_VALUES['subscription_type']:
         return False, "subscription_type must be 'Basic', 'Standard', or 'Premium'"
     
     contract_length = data.get('contract_length')
-    if contract_length not in ['Monthly', 'Quarterly', 'Annual', 'monthly', 'quarterly', 'annual']:
+    if contract_length not in CATEGORY_VALUES['contract_length']:
         return False, "contract_length must be 'Monthly', 'Quarterly', or 'Annual'"
     
     return True, ""
 
 
+def validate_frame(df: pd.DataFrame) -> np.ndarray:
+    """
+    Vectorized validate_input over many rows at once
+    
+    Args:
+        df: DataFrame with preprocessing column names
+        
+    Returns:
+        Boolean array, True where the row is valid
+    """
+    valid = np.ones(len(df), dtype=bool)
+    for field, min_val, max_val in VALIDATION_RANGES:
+        values = pd.to_numeric(df[field], errors='coerce')
+        valid &= values.between(min_val, max_val).to_numpy()
+    for field, allowed in CATEGORY_VALUES.items():
+        valid &= df[field].isin(list(allowed)).to_numpy()
+    return valid
+
+
 # def preprocess_batch(df: pd.DataFrame) -> pd.DataFrame:
 #     """
 #     Preprocess batch of data (for training/evaluation)
@@ -233,38 +282,150 @@ def save_production_data(data: Dict[str, Any], prediction: int,
         prediction: Model prediction (0 or 1)
         production_file: Path to save production data 
     """
-    import os
-    
-    # Set default path relative to serving_pipeline directory
-    if production_file is None:
-        # Get the directory where this file is located
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        production_file = os.path.join(current_dir, "data_model", "production", "production.csv")
-    
-    # Add metadata
-    record = data.copy()
-    record['prediction'] = prediction
-    
-    # Create DataFrame
-    df_new = pd.DataFrame([record])
-    
-    # Append to file
-    if os.path.exists(production_file):
-        df_existing = pd.read_csv(production_file)
-        df_combined = pd.concat([df_existing, df_new], ignore_index=True)
+    return save_production_data_batch([data], [prediction], production_file)
+
+
+def _default_production_file() -> str:
+    """Production data (Parquet dataset directory) relative to the serving_pipeline directory"""
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, "data_model", "production", "production_log")
+
+
+def _write_production_parquet(records: List[Dict[str, Any]], production_dir: str):
+    """Write records as a new zstd Parquet part file of the production dataset"""
+    os.makedirs(production_dir, exist_ok=True)
+    part_name = f"part-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+    part_path = os.path.join(production_dir, part_name)
+    # Write under a dot-prefixed name (skipped by dataset discovery) so readers
+    # never see a file without its footer
+    tmp_path = os.path.join(production_dir, "." + part_name)
+    pq.write_table(pa.Table.from_pylist(records), tmp_path, compression='zstd')
+    os.replace(tmp_path, part_path)
+    logger.info(f"Saved {len(records)} production records to: {part_path}")
+
+
+def _write_production_records(records: List[Dict[str, Any]], production_file: str):
+    """Append records to a .csv production file or a Parquet dataset directory"""
+    if production_file.endswith('.csv'):
+        _append_production_records(records, production_file)
     else:
-        df_combined = df_new
+        _write_production_parquet(records, production_file)
+
+
+def _append_production_records(records: List[Dict[str, Any]], production_file: str):
+    """Append records to the production CSV (header only when creating it)"""
+    fieldnames = list(records[0])
+    with _production_file_lock:
+        os.makedirs(os.path.dirname(production_file), exist_ok=True)
+        if os.path.exists(production_file):
+            with open(production_file, newline='') as f:
+                existing_columns = next(csv.reader(f), [])
+            if set(existing_columns) == set(fieldnames):
+                with open(production_file, 'a', newline='') as f:
+                    csv.DictWriter(f, fieldnames=existing_columns).writerows(records)
+            else:
+                # Schema changed: rewrite once with the union of columns
+                df_existing = pd.read_csv(production_file)
+                pd.concat([df_existing, pd.DataFrame.from_records(records)], ignore_index=True).to_csv(
+                    production_file, index=False
+                )
+        else:
+            with open(production_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(records)
+    
+    logger.info(f"Saved {len(records)} production records to: {production_file}")
+
+
+class ProductionDataBuffer:
+    """
+    Buffers production records in memory and appends them in batches
     
-    # Save
-    os.makedirs(os.path.dirname(production_file), exist_ok=True)
-    df_combined.to_csv(production_file, index=False)
+    Records are written once max_records are buffered, or by a background
+    timer every flush_interval seconds, so each request only pays for a
+    list append. Each flush becomes one Parquet part file (or one CSV
+    append for .csv paths).
+    """
+    
+    def __init__(self, production_file: str, max_records: int = 1024,
+                 flush_interval: float = 5.0):
+        self.production_file = production_file
+        self.max_records = max_records
+        self.flush_interval = flush_interval
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._timer.start()
+    
+    def add(self, inputs: List[Dict[str, Any]], predictions: List[int]) -> int:
+        """Buffer records, flushing when the buffer is full"""
+        timestamp = datetime.now()
+        records = [
+            {**data, 'prediction': pred, 'timestamp': timestamp}
+            for data, pred in zip(inputs, predictions)
+        ]
+        with self._lock:
+            self._records.extend(records)
+            full = len(self._records) >= self.max_records
+        if full:
+            self.flush()
+        return len(records)
+    
+    def flush(self) -> int:
+        """Write all buffered records"""
+        with self._lock:
+            records, self._records = self._records, []
+        if records:
+            _write_production_records(records, self.production_file)
+        return len(records)
+    
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush production data: {e}")
+
+
+# One buffer per production file
+_production_buffers: Dict[str, ProductionDataBuffer] = {}
+
+
+def _get_production_buffer(production_file: str) -> ProductionDataBuffer:
+    with _production_file_lock:
+        buffer = _production_buffers.get(production_file)
+        if buffer is None:
+            buffer = _production_buffers[production_file] = ProductionDataBuffer(production_file)
+        return buffer
+
+
+def save_production_data_batch(inputs: List[Dict[str, Any]], predictions: List[int],
+                               production_file: str = None):
+    """
+    Queue many predictions for the production dataset
     
-    # Log for debugging
-    import logging
-    logger = logging.getLogger(__name__)
-    logger.info(f"Saved production data to: {production_file} (Total records: {len(df_combined)})")
+    Records go through a ProductionDataBuffer and are written in batches as
+    Parquet part files, so the cost neither grows with the data size nor
+    hits the disk on every request.
     
-    return len(df_combined)
+    Args:
+        inputs: Input data dictionaries
+        predictions: Model predictions (0 or 1), aligned with inputs
+        production_file: Parquet dataset directory (or .csv file) to save to
+        
+    Returns:
+        Number of records queued
+    """
+    if production_file is None:
+        production_file = _default_production_file()
+    return _get_production_buffer(production_file).add(inputs, predictions)
+
+
+def flush_production_data() -> int:
+    """Write all buffered production records (call on shutdown)"""
+    return sum(buffer.flush() for buffer in list(_production_buffers.values()))
 
 
 def get_feature_names() -> list:
@@ -1,26 +1,61 @@
-from feast import FeatureStore
+from feast import FeatureService, FeatureStore
+from feast.errors import FeatureServiceNotFoundException
 import pandas as pd
+import atexit
 import os
+import re
+from functools import lru_cache
 from typing import Union, List
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 repo_path = os.path.join(project_root, "churn_feature_store", "churn_features", "feature_repo")
 
 FEATURES = [
-    # ---------- customer_demographics ----------
-    "customer_demographics:age",
-    "customer_demographics:gender",
-    "customer_demographics:tenure_months",
-    "customer_demographics:subscription_type",
-    "customer_demographics:contract_length",
-    # ---------- customer_behavior ----------
-    "customer_behavior:usage_frequency",
-    "customer_behavior:support_calls",
-    "customer_behavior:payment_delay_days",
-    "customer_behavior:total_spend",
-    "customer_behavior:last_interaction_days",
+    # ---------- customer_features (single view: one online store read) ----------
+    "customer_features:age",
+    "customer_features:gender",
+    "customer_features:tenure_months",
+    "customer_features:subscription_type",
+    "customer_features:contract_length",
+    "customer_features:usage_frequency",
+    "customer_features:support_calls",
+    "customer_features:payment_delay_days",
+    "customer_features:total_spend",
+    "customer_features:last_interaction_days",
 ]
 
+# Customer IDs made only of digits are looked up as int64 entity keys
+_INT_ID_RE = re.compile(r"-?\d+")
+
+# Feature service covering FEATURES (defined in the feature repo)
+FEATURE_SERVICE_NAME = "churn_features"
+
+
+@lru_cache(maxsize=1)
+def _get_store() -> FeatureStore:
+    """
+    FeatureStore created once per process, so the registry is parsed a single
+    time and online store connections stay warm; closed at interpreter exit
+    """
+    store = FeatureStore(repo_path=repo_path)
+    # Feast versions with context-manager support release their sessions in __exit__
+    if hasattr(store, "__exit__"):
+        atexit.register(store.__exit__, None, None, None)
+    return store
+
+
+@lru_cache(maxsize=1)
+def _get_features() -> Union[FeatureService, List[str]]:
+    """
+    Resolved feature service, or the FEATURES references if the registry
+    does not have it yet (repo not re-applied)
+    """
+    try:
+        return _get_store().get_feature_service(FEATURE_SERVICE_NAME)
+    except FeatureServiceNotFoundException:
+        print(f"Feature service '{FEATURE_SERVICE_NAME}' not found, using feature references")
+        return FEATURES
+
 
 def get_customer_features(customer_id: Union[int, str, List[Union[int, str]]]) -> pd.DataFrame:
     """
@@ -32,7 +67,7 @@ def get_customer_features(customer_id: Union[int, str, List[Union[int, str]]]) -
     Returns:
         DataFrame containing features
     """
-    store = FeatureStore(repo_path=repo_path)
+    store = _get_store()
     
     # Convert customer_id to list if single value
     if not isinstance(customer_id, list):
@@ -40,21 +75,18 @@ def get_customer_features(customer_id: Union[int, str, List[Union[int, str]]]) -
     else:
         customer_ids = customer_id
     
-    # Prepare entity rows
+    # Prepare entity rows: integer IDs as int, anything else as string
     entity_rows = []
     for cid in customer_ids:
-        try:
-            # Try to convert to int if possible
-            cid_int = int(cid)
-            entity_rows.append({"customer_id": cid_int})
-        except (ValueError, TypeError):
-            # If not int, use as string
-            entity_rows.append({"customer_id": str(cid)})
+        cid_str = str(cid).strip()
+        entity_rows.append(
+            {"customer_id": int(cid_str) if _INT_ID_RE.fullmatch(cid_str) else cid_str}
+        )
     
     # Get features from feature store
     df = store.get_online_features(
         entity_rows=entity_rows,
-        features=FEATURES,
+        features=_get_features(),
     ).to_df()
     print(f"Features for customer_id: {customer_id} - Shape: {df.shape}")
     return df
@@ -63,10 +95,10 @@ def get_customer_features(customer_id: Union[int, str, List[Union[int, str]]]) -
 # Main execution when run as script
 if __name__ == "__main__":
     entity_rows = [{"customer_id": i} for i in range(2, 40)]
-    store = FeatureStore(repo_path=repo_path)
+    store = _get_store()
     df = store.get_online_features(
         entity_rows=entity_rows,
-        features=FEATURES,
+        features=_get_features(),
     ).to_df()
     print(df)
 